@@ -11,13 +11,16 @@ import os
 import statistics
 import uuid
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from .models import (
@@ -49,11 +52,17 @@ from .models import (
 from .database import delete_analysis as db_delete_analysis
 from .database import get_analysis as db_get_analysis
 from .database import init_db, list_analyses as db_list_analyses, save_analysis as db_save_analysis
-from .nlp_analysis import generate_wordcloud_image, run_full_nlp_analysis
+from .nlp_analysis import generate_wordcloud_image, preload_spacy, run_full_nlp_analysis
 from .reddit_client import reddit_client
-from .sentiment import analyze_batch, preload_model
-from .summarizer import generate_summary, generate_tribal_narrative
-from .tribal_logic import build_topic_groups, classify_tribalism, classify_ratioed_posts, concept_search
+from .sentiment import analyze_batch_async, shutdown_worker, start_worker
+from .summarizer import close_gemini_client, generate_summaries
+from .tribal_logic import (
+    AnalysisCorpus,
+    build_topic_groups,
+    classify_ratioed_posts,
+    classify_tribalism,
+    concept_search,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -62,6 +71,7 @@ app = FastAPI(
     title="Undercurrent",
     version="2.0.0",
     description="The hidden beliefs of online communities — tribalism analysis and sentiment decoding for Reddit",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -76,6 +86,20 @@ app.add_middleware(
 _analyses: dict[str, AnalysisResponse] = {}
 _analysis_posts: dict[str, list[PostWithSentiment]] = {}
 _analysis_comments: dict[str, list[CommentWithSentiment]] = {}
+_analysis_corpora: dict[str, AnalysisCorpus] = {}
+
+
+def _get_corpus(analysis_id: str) -> AnalysisCorpus:
+    """Lowercased search texts for a stored analysis, built on first use.
+
+    Rebuilt if the analysis under this id has since been replaced.
+    """
+    analysis = _analyses[analysis_id]
+    corpus = _analysis_corpora.get(analysis_id)
+    if corpus is None or corpus.posts is not analysis.posts:
+        corpus = AnalysisCorpus(analysis.posts, analysis.comments)
+        _analysis_corpora[analysis_id] = corpus
+    return corpus
 
 
 # ── Startup ────────────────────────────────────────────────────────────────
@@ -83,19 +107,27 @@ _analysis_comments: dict[str, list[CommentWithSentiment]] = {}
 async def startup():
     logger.info("Starting up — initializing database...")
     await init_db()
-    logger.info("Database initialized. Preloading sentiment model in background...")
+    logger.info("Database initialized. Starting sentiment worker and preloading spaCy...")
+    start_worker()
 
     def _safe_preload():
         try:
-            preload_model()
-            logger.info("Sentiment model preloaded successfully")
+            preload_spacy()
+            logger.info("spaCy model preloaded successfully")
         except Exception as e:
-            logger.error(f"Model preload failed (will retry on first request): {e}")
+            logger.error(f"spaCy preload failed (will retry on first request): {e}")
 
     asyncio.get_event_loop().run_in_executor(None, _safe_preload)
     logger.info("Startup complete — server is ready to accept requests")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await reddit_client.aclose()
+    await close_gemini_client()
+    shutdown_worker()
+
+
 # ── Health check ───────────────────────────────────────────────────────────
 @app.get("/api/health")
 async def health():
@@ -103,6 +135,22 @@ async def health():
     return {"status": "ok", "model_loaded": is_model_loaded()}
 
 
+# ── Serialization helpers ─────────────────────────────────────────────────
+
+def _sse_event(data: dict) -> str:
+    return f"data: {orjson.dumps(data).decode()}\n\n"
+
+
+def _sse_results(result: AnalysisResponse) -> str:
+    """SSE results event, serialized by pydantic-core in a single pass."""
+    return f'data: {{"stage":"results","data":{result.model_dump_json()}}}\n\n'
+
+
+def _model_response(model) -> Response:
+    """Return a pydantic model as JSON without FastAPI's jsonable_encoder walk."""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 # ── Analysis (SSE streaming) ──────────────────────────────────────────────
 
 def _compute_sentiment_stats(scores: list[float], labels: list[SentimentLabel]) -> SentimentStats:
@@ -123,24 +171,38 @@ def _compute_sentiment_stats(scores: list[float], labels: list[SentimentLabel])
     )
 
 
+# Ordinal of 1970-01-01, for turning epoch-day numbers back into dates
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
 def _build_time_series(
     posts: list[PostWithSentiment],
 ) -> list[TimeSeriesPoint]:
     """Group post sentiments by date and subreddit."""
-    by_day_sub: dict[tuple[str, str], list[float]] = defaultdict(list)
-
-    for p in posts:
-        dt = datetime.fromtimestamp(p.post.created_utc, tz=timezone.utc)
-        day_str = dt.strftime("%Y-%m-%d")
-        by_day_sub[(day_str, p.post.subreddit)].append(p.sentiment.compound_score)
+    if not posts:
+        return []
+    # Key each post by (UTC day since the epoch, subreddit index), laid out so
+    # key order is (day, subreddit) order, and group with one stable argsort
+    # instead of a dict of lists. Each day is formatted once below. Means stay
+    # exact (statistics.mean): 4-decimal scores often average to a rounding tie.
+    n = len(posts)
+    days = np.fromiter((p.post.created_utc // 86400 for p in posts), dtype=np.int64, count=n)
+    scores = np.fromiter((p.sentiment.compound_score for p in posts), dtype=np.float64, count=n)
+    subs, sub_idx = np.unique([p.post.subreddit for p in posts], return_inverse=True)
+    first_day = int(days.min())
+    keys = (days - first_day) * len(subs) + sub_idx
+    counts = np.bincount(keys)
+    present = np.flatnonzero(counts)
+    groups = np.split(scores[np.argsort(keys, kind="stable")], np.cumsum(counts[present])[:-1])
 
     points = []
-    for (day, sub), scores in sorted(by_day_sub.items()):
+    for key, group in zip(present.tolist(), groups):
+        day, sub = divmod(key, len(subs))
         points.append(TimeSeriesPoint(
-            date=day,
-            avg_sentiment=round(statistics.mean(scores), 4),
-            count=len(scores),
-            subreddit=sub,
+            date=date.fromordinal(_EPOCH_ORDINAL + first_day + day).isoformat(),
+            avg_sentiment=round(statistics.mean(group.tolist()), 4),
+            count=len(group),
+            subreddit=str(subs[sub]),
         ))
     return points
 
@@ -153,27 +215,22 @@ async def _process_fetched_data(
     request_params: dict | None = None,
 ):
     """Stages 2-5: sentiment, aggregation, NLP, summary. Yields SSE events."""
-    def sse_event(data: dict) -> str:
-        return f"data: {json.dumps(data)}\n\n"
-
     # ── Stage 2: Sentiment analysis ───────────────────────────────────
-    yield sse_event({
+    yield _sse_event({
         "stage": "analyzing",
         "message": f"Running sentiment analysis on {len(all_posts)} posts...",
         "progress": 0.3,
     })
 
     post_texts = [f"{p.title} {p.selftext}".strip() for p in all_posts]
-    post_sentiments = await asyncio.get_event_loop().run_in_executor(
-        None, analyze_batch, post_texts
-    )
+    post_sentiments = await analyze_batch_async(post_texts)
 
     posts_with_sentiment = []
     for post, sentiment in zip(all_posts, post_sentiments):
         if sentiment is not None:
             posts_with_sentiment.append(PostWithSentiment(post=post, sentiment=sentiment))
 
-    yield sse_event({
+    yield _sse_event({
         "stage": "analyzing",
         "message": f"Analyzed {len(posts_with_sentiment)} posts",
         "progress": 0.5,
@@ -181,16 +238,14 @@ async def _process_fetched_data(
 
     comments_with_sentiment = []
     if all_comments:
-        yield sse_event({
+        yield _sse_event({
             "stage": "analyzing",
             "message": f"Analyzing {len(all_comments)} comments...",
             "progress": 0.5,
         })
 
         comment_texts = [c.body for c in all_comments]
-        comment_sentiments = await asyncio.get_event_loop().run_in_executor(
-            None, analyze_batch, comment_texts
-        )
+        comment_sentiments = await analyze_batch_async(comment_texts)
 
         for comment, sentiment in zip(all_comments, comment_sentiments):
             if sentiment is not None:
@@ -198,14 +253,14 @@ async def _process_fetched_data(
                     CommentWithSentiment(comment=comment, sentiment=sentiment)
                 )
 
-        yield sse_event({
+        yield _sse_event({
             "stage": "analyzing",
             "message": f"Analyzed {len(comments_with_sentiment)} comments",
             "progress": 0.65,
         })
 
     # ── Stage 3: Aggregate stats ──────────────────────────────────────
-    yield sse_event({
+    yield _sse_event({
         "stage": "aggregating",
         "message": "Computing statistics...",
         "progress": 0.65,
@@ -237,7 +292,7 @@ async def _process_fetched_data(
     time_series = _build_time_series(posts_with_sentiment)
 
     # ── Stage 4: NLP analysis ─────────────────────────────────────────
-    yield sse_event({
+    yield _sse_event({
         "stage": "nlp",
         "message": "Running NLP analysis (entities, n-grams, statistics)...",
         "progress": 0.7,
@@ -250,14 +305,14 @@ async def _process_fetched_data(
         None, run_full_nlp_analysis, nlp_post_texts, nlp_comment_texts
     )
 
-    yield sse_event({
+    yield _sse_event({
         "stage": "nlp",
         "message": "NLP analysis complete",
         "progress": 0.8,
     })
 
     # ── Stage 4.5: Tribalism classification ────────────────────────────
-    yield sse_event({
+    yield _sse_event({
         "stage": "tribal",
         "message": "Classifying tribal patterns...",
         "progress": 0.82,
@@ -271,36 +326,40 @@ async def _process_fetched_data(
     )
     tribal_topics = classify_tribalism(topic_groups)
     ratioed_posts = classify_ratioed_posts(posts_with_sentiment, comments_with_sentiment)
-    tribal_narrative = generate_tribal_narrative(tribal_topics, ratioed_posts)
 
-    tribal_analysis = TribalAnalysis(
-        topics=tribal_topics,
-        ratioed_posts=ratioed_posts,
-        narrative=tribal_narrative,
-    )
-
-    yield sse_event({
+    yield _sse_event({
         "stage": "tribal",
         "message": f"Identified {len(tribal_topics)} tribal topics",
         "progress": 0.88,
     })
 
     # ── Stage 5: Generate summary ─────────────────────────────────────
-    yield sse_event({
+    yield _sse_event({
         "stage": "summarizing",
         "message": "Generating summary...",
         "progress": 0.9,
     })
 
-    summary_text = generate_summary(
+    summary_text, tribal_narrative = await generate_summaries(
         subreddit_summaries, posts_with_sentiment, comments_with_sentiment, nlp_insights,
-        tribal_topics=tribal_topics, ratioed_count=len(ratioed_posts),
+        tribal_topics, ratioed_posts,
+    )
+
+    tribal_analysis = TribalAnalysis(
+        topics=tribal_topics,
+        ratioed_posts=ratioed_posts,
+        narrative=tribal_narrative,
     )
 
     # ── Build final response ──────────────────────────────────────────
-    sentiment_distribution = [p.sentiment.compound_score for p in posts_with_sentiment]
-    if comments_with_sentiment:
-        sentiment_distribution.extend(c.sentiment.compound_score for c in comments_with_sentiment)
+    sentiment_distribution = np.fromiter(
+        chain(
+            (p.sentiment.compound_score for p in posts_with_sentiment),
+            (c.sentiment.compound_score for c in comments_with_sentiment),
+        ),
+        dtype=np.float64,
+        count=len(posts_with_sentiment) + len(comments_with_sentiment),
+    )
 
     result = AnalysisResponse(
         analysis_id=analysis_id,
@@ -336,65 +395,63 @@ async def _process_fetched_data(
     except Exception as e:
         logger.error(f"Failed to save analysis to database: {e}")
 
-    yield sse_event({
+    yield _sse_event({
         "stage": "complete",
         "message": "Analysis complete!",
         "progress": 1.0,
         "analysis_id": analysis_id,
     })
 
-    yield sse_event({
-        "stage": "results",
-        "data": result.model_dump(),
-    })
+    yield _sse_results(result)
 
 
 async def _run_analysis(req: AnalysisRequest):
     """Generator that yields SSE events during analysis."""
     analysis_id = str(uuid.uuid4())
 
-    def sse_event(data: dict) -> str:
-        return f"data: {json.dumps(data)}\n\n"
-
-    yield sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
+    yield _sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
 
     # ── Stage 1: Fetch data ───────────────────────────────────────────
     all_posts = []
     all_comments = []
 
-    for i, subreddit in enumerate(req.subreddits):
-        yield sse_event({
-            "stage": "fetching",
-            "message": f"Fetching posts from r/{subreddit}...",
-            "progress": (i / len(req.subreddits)) * 0.3,
-        })
+    # All subreddits are fetched concurrently; the client's shared rate
+    # limiter keeps the combined request rate within Reddit's limit.
+    yield _sse_event({
+        "stage": "fetching",
+        "message": f"Fetching posts from {', '.join(f'r/{s}' for s in req.subreddits)}...",
+        "progress": 0,
+    })
 
-        try:
-            posts, comments = await reddit_client.fetch_all(
-                subreddit=subreddit,
-                sort=req.sort,
-                time_filter=req.time_filter,
-                post_limit=req.post_limit,
-                include_comments=req.include_comments,
-                comment_depth=req.comment_depth,
-            )
-            all_posts.extend(posts)
-            all_comments.extend(comments)
-
-            yield sse_event({
-                "stage": "fetching",
-                "message": f"Fetched {len(posts)} posts and {len(comments)} comments from r/{subreddit}",
-                "progress": ((i + 1) / len(req.subreddits)) * 0.3,
-            })
-        except ValueError as e:
-            yield sse_event({"stage": "error", "message": str(e)})
+    results = await reddit_client.fetch_all_multi(
+        subreddits=req.subreddits,
+        sort=req.sort,
+        time_filter=req.time_filter,
+        post_limit=req.post_limit,
+        include_comments=req.include_comments,
+        comment_depth=req.comment_depth,
+    )
+
+    for i, (subreddit, result) in enumerate(zip(req.subreddits, results)):
+        if isinstance(result, ValueError):
+            yield _sse_event({"stage": "error", "message": str(result)})
             return
-        except Exception as e:
-            yield sse_event({"stage": "error", "message": f"Failed to fetch r/{subreddit}: {str(e)}"})
+        if isinstance(result, BaseException):
+            yield _sse_event({"stage": "error", "message": f"Failed to fetch r/{subreddit}: {str(result)}"})
             return
 
+        posts, comments = result
+        all_posts.extend(posts)
+        all_comments.extend(comments)
+
+        yield _sse_event({
+            "stage": "fetching",
+            "message": f"Fetched {len(posts)} posts and {len(comments)} comments from r/{subreddit}",
+            "progress": ((i + 1) / len(req.subreddits)) * 0.3,
+        })
+
     if not all_posts:
-        yield sse_event({"stage": "error", "message": "No posts fetched. Check subreddit names."})
+        yield _sse_event({"stage": "error", "message": "No posts fetched. Check subreddit names."})
         return
 
     # Delegate to shared processing pipeline
@@ -471,9 +528,6 @@ async def list_samples():
 
 async def _run_sample_analysis(subreddit: str):
     """Load sample JSON, check cache, run analysis pipeline via SSE."""
-    def sse_event(data: dict) -> str:
-        return f"data: {json.dumps(data)}\n\n"
-
     analysis_id = f"sample_{subreddit.lower()}"
 
     # 1) Check for precomputed .analysis.json (instant)
@@ -488,14 +542,14 @@ async def _run_sample_analysis(subreddit: str):
         _analysis_posts[analysis_id] = result.posts
         _analysis_comments[analysis_id] = result.comments
 
-        yield sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
-        yield sse_event({
+        yield _sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
+        yield _sse_event({
             "stage": "complete",
             "message": "Loaded instantly!",
             "progress": 1.0,
             "analysis_id": analysis_id,
         })
-        yield sse_event({"stage": "results", "data": precomputed_data})
+        yield _sse_event({"stage": "results", "data": precomputed_data})
         return
 
     # 2) Check SQLite cache
@@ -507,28 +561,28 @@ async def _run_sample_analysis(subreddit: str):
         _analysis_posts[analysis_id] = result.posts
         _analysis_comments[analysis_id] = result.comments
 
-        yield sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
-        yield sse_event({
+        yield _sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
+        yield _sse_event({
             "stage": "complete",
             "message": "Loaded from cache!",
             "progress": 1.0,
             "analysis_id": analysis_id,
         })
-        yield sse_event({"stage": "results", "data": cached})
+        yield _sse_event({"stage": "results", "data": cached})
         return
 
     # 3) Full pipeline fallback
     sample_data = _load_sample(subreddit)
     if sample_data is None:
-        yield sse_event({"stage": "error", "message": f"No sample data found for r/{subreddit}"})
+        yield _sse_event({"stage": "error", "message": f"No sample data found for r/{subreddit}"})
         return
 
-    yield sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
+    yield _sse_event({"stage": "started", "analysis_id": analysis_id, "progress": 0})
 
     all_posts = [RedditPost(**p) for p in sample_data["posts"]]
     all_comments = [RedditComment(**c) for c in sample_data["comments"]]
 
-    yield sse_event({
+    yield _sse_event({
         "stage": "fetching",
         "message": f"Loaded {len(all_posts)} posts and {len(all_comments)} comments from sample data",
         "progress": 0.3,
@@ -561,11 +615,11 @@ async def analyze_sample(req: SampleAnalyzeRequest):
 @app.get("/api/analysis/{analysis_id}")
 async def get_analysis(analysis_id: str):
     if analysis_id in _analyses:
-        return _analyses[analysis_id]
+        return _model_response(_analyses[analysis_id])
     # Fall back to database
     db_data = await db_get_analysis(analysis_id)
     if db_data is not None:
-        return db_data
+        return ORJSONResponse(db_data)
     raise HTTPException(status_code=404, detail="Analysis not found")
 
 
@@ -576,7 +630,7 @@ async def keyword_sentiment(req: KeywordSentimentRequest):
     if req.analysis_id not in _analyses:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    analysis = _analyses[req.analysis_id]
+    corpus = _get_corpus(req.analysis_id)
     keyword_lower = req.keyword.lower()
 
     with_kw_scores = []
@@ -584,8 +638,7 @@ async def keyword_sentiment(req: KeywordSentimentRequest):
     without_kw_scores = []
     without_kw_labels = []
 
-    for p in analysis.posts:
-        text = f"{p.post.title} {p.post.selftext}".lower()
+    for p, text in zip(corpus.posts, corpus.post_texts):
         if keyword_lower in text:
             with_kw_scores.append(p.sentiment.compound_score)
             with_kw_labels.append(p.sentiment.label)
@@ -593,8 +646,7 @@ async def keyword_sentiment(req: KeywordSentimentRequest):
             without_kw_scores.append(p.sentiment.compound_score)
             without_kw_labels.append(p.sentiment.label)
 
-    for c in analysis.comments:
-        text = c.comment.body.lower()
+    for c, text in zip(corpus.comments, corpus.comment_texts):
         if keyword_lower in text:
             with_kw_scores.append(c.sentiment.compound_score)
             with_kw_labels.append(c.sentiment.label)
@@ -611,9 +663,14 @@ async def keyword_sentiment(req: KeywordSentimentRequest):
 
 # ── Enriched keyword analysis ─────────────────────────────────────────────
 
-def _extract_snippet(text: str, keyword: str, max_len: int = 200) -> str:
-    """Extract a snippet of text around the keyword."""
-    lower = text.lower()
+def _extract_snippet(
+    text: str, keyword: str, max_len: int = 200, text_lower: Optional[str] = None,
+) -> str:
+    """Extract a snippet of text around the keyword.
+
+    Pass ``text_lower`` when the lowercased text is already at hand.
+    """
+    lower = text_lower if text_lower is not None else text.lower()
     idx = lower.find(keyword.lower())
     if idx == -1:
         return text[:max_len]
@@ -634,6 +691,7 @@ async def keyword_analysis(req: KeywordAnalysisRequest):
         raise HTTPException(status_code=404, detail="Analysis not found")
 
     analysis = _analyses[req.analysis_id]
+    corpus = _get_corpus(req.analysis_id)
     results = []
 
     # Compute baseline (all content) stats
@@ -654,36 +712,36 @@ async def keyword_analysis(req: KeywordAnalysisRequest):
         timeline_data: dict[str, list[float]] = defaultdict(list)
 
         # Search posts
-        for p in analysis.posts:
-            text = f"{p.post.title} {p.post.selftext}"
-            if kw_lower in text.lower():
+        for p, text_lower in zip(corpus.posts, corpus.post_texts):
+            if kw_lower in text_lower:
                 matching_posts.append(p)
                 matching_scores.append(p.sentiment.compound_score)
                 matching_labels.append(p.sentiment.label)
                 dt = datetime.fromtimestamp(p.post.created_utc, tz=timezone.utc)
                 timeline_data[dt.strftime("%Y-%m-%d")].append(p.sentiment.compound_score)
                 if len(snippets) < 8:
+                    text = f"{p.post.title} {p.post.selftext}"
                     snippets.append(ContextSnippet(
-                        text=_extract_snippet(text, keyword),
+                        text=_extract_snippet(text, keyword, text_lower=text_lower),
                         sentiment_score=p.sentiment.compound_score,
-                        sentiment_label=p.sentiment.label.value,
+                        sentiment_label=p.sentiment.label,
                         source_type="post",
                         post_title=p.post.title[:100],
                         permalink=f"https://reddit.com{p.post.permalink}",
                     ))
 
         # Search comments
-        for c in analysis.comments:
-            if kw_lower in c.comment.body.lower():
+        for c, text_lower in zip(corpus.comments, corpus.comment_texts):
+            if kw_lower in text_lower:
                 matching_scores.append(c.sentiment.compound_score)
                 matching_labels.append(c.sentiment.label)
                 dt = datetime.fromtimestamp(c.comment.created_utc, tz=timezone.utc)
                 timeline_data[dt.strftime("%Y-%m-%d")].append(c.sentiment.compound_score)
                 if len(snippets) < 8:
                     snippets.append(ContextSnippet(
-                        text=_extract_snippet(c.comment.body, keyword),
+                        text=_extract_snippet(c.comment.body, keyword, text_lower=text_lower),
                         sentiment_score=c.sentiment.compound_score,
-                        sentiment_label=c.sentiment.label.value,
+                        sentiment_label=c.sentiment.label,
                         source_type="comment",
                     ))
 
@@ -716,7 +774,7 @@ async def keyword_analysis(req: KeywordAnalysisRequest):
             distribution=matching_scores,
         ))
 
-    return KeywordAnalysisResponse(analysis_id=req.analysis_id, results=results)
+    return _model_response(KeywordAnalysisResponse(analysis_id=req.analysis_id, results=results))
 
 
 # ── Concept search ────────────────────────────────────────────────────────
@@ -727,8 +785,7 @@ async def concept_search_endpoint(req: ConceptSearchRequest):
     if req.analysis_id not in _analyses:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    analysis = _analyses[req.analysis_id]
-    result = concept_search(analysis.posts, analysis.comments, req.query)
+    result = concept_search(_get_corpus(req.analysis_id), req.query)
 
     return ConceptSearchResponse(**result)
 
@@ -793,14 +850,14 @@ async def export_csv(analysis_id: str):
             "post", p.post.subreddit, p.post.id, p.post.title, p.post.selftext,
             p.post.author, p.post.score, p.post.num_comments, p.post.created_utc,
             f"https://reddit.com{p.post.permalink}",
-            p.sentiment.label.value, p.sentiment.confidence, p.sentiment.compound_score,
+            p.sentiment.label, p.sentiment.confidence, p.sentiment.compound_score,
         ])
 
     for c in analysis.comments:
         writer.writerow([
             "comment", c.comment.subreddit, c.comment.id, "", c.comment.body,
             c.comment.author, c.comment.score, "", c.comment.created_utc, "",
-            c.sentiment.label.value, c.sentiment.confidence, c.sentiment.compound_score,
+            c.sentiment.label, c.sentiment.confidence, c.sentiment.compound_score,
         ])
 
     output.seek(0)
@@ -953,7 +1010,7 @@ async def get_snapshot(date: str, subreddit: str):
     cache_key = f"snapshot_{sub_lower}_{date}"
 
     if cache_key in _analyses:
-        return _analyses[cache_key]
+        return _model_response(_analyses[cache_key])
 
     analysis_path = SNAPSHOTS_DIR / date / sub_lower / "analysis.json"
     if not analysis_path.exists():
@@ -967,7 +1024,7 @@ async def get_snapshot(date: str, subreddit: str):
     _analysis_posts[cache_key] = result.posts
     _analysis_comments[cache_key] = result.comments
 
-    return result
+    return _model_response(result)
 
 
 # ── History endpoints ────────────────────────────────────────────────────
@@ -984,7 +1041,7 @@ async def get_saved_analysis(analysis_id: str):
     data = await db_get_analysis(analysis_id)
     if data is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
-    return data
+    return ORJSONResponse(data)
 
 
 @app.delete("/api/analyses/{analysis_id}")
@@ -997,6 +1054,7 @@ async def delete_saved_analysis(analysis_id: str):
     _analyses.pop(analysis_id, None)
     _analysis_posts.pop(analysis_id, None)
     _analysis_comments.pop(analysis_id, None)
+    _analysis_corpora.pop(analysis_id, None)
     return {"status": "ok"}
 
 
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Any, Literal, Optional
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, WithJsonSchema
 
 
 # ── Enums ──────────────────────────────────────────────────────────────────
@@ -31,6 +32,33 @@ class SentimentLabel(str, Enum):
     negative = "negative"
 
 
+# Plain-string form used inside result models: pydantic-core validates a
+# Literal with a set lookup instead of building Enum members. Values compare
+# equal to the SentimentLabel members above.
+SentimentLabelValue = Literal["positive", "neutral", "negative"]
+
+
+# ── Field Types ────────────────────────────────────────────────────────────
+
+def _to_float_array(value: Any) -> np.ndarray:
+    return np.asarray(value, dtype=np.float64)
+
+
+def _float_array_to_list(value: Any) -> list[float]:
+    return np.asarray(value, dtype=np.float64).tolist()
+
+
+# Large score vectors (histogram inputs) held as one contiguous float array:
+# validation is a single np.asarray instead of one float check per element,
+# and serialization is a single tolist(). On the wire it is a plain number list.
+CompactFloats = Annotated[
+    Any,
+    PlainValidator(_to_float_array),
+    PlainSerializer(_float_array_to_list, return_type=list[float]),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
 # ── Request Models ─────────────────────────────────────────────────────────
 
 class AnalysisRequest(BaseModel):
@@ -66,6 +94,8 @@ class KeywordSentimentRequest(BaseModel):
 # ── Reddit Data Models ─────────────────────────────────────────────────────
 
 class RedditPost(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     subreddit: str
     title: str
@@ -79,6 +109,8 @@ class RedditPost(BaseModel):
 
 
 class RedditComment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     post_id: str
     subreddit: str
@@ -91,12 +123,17 @@ class RedditComment(BaseModel):
 # ── Sentiment Results ──────────────────────────────────────────────────────
 
 class SentimentResult(BaseModel):
-    label: SentimentLabel
+    model_config = ConfigDict(frozen=True)
+
+    label: SentimentLabelValue
     confidence: float = Field(..., ge=0, le=1)
     compound_score: float = Field(..., ge=-1, le=1)
-    scores: dict[str, float] = Field(default_factory=dict, description="Per-label probabilities")
+    scores: Optional[dict[str, float]] = Field(None, description="Per-label probabilities")
 
 
+# Build these with the normal constructor: given RedditPost/SentimentResult
+# instances, pydantic-core only isinstance-checks them, which is about twice as
+# fast as the pure-Python model_construct.
 class PostWithSentiment(BaseModel):
     post: RedditPost
     sentiment: SentimentResult
@@ -190,7 +227,7 @@ class KeywordAnalysisResult(BaseModel):
     top_negative: list[PostWithSentiment]
     timeline: list[KeywordTimePoint]
     snippets: list[ContextSnippet]
-    distribution: list[float]
+    distribution: CompactFloats
 
 
 class KeywordAnalysisRequest(BaseModel):
@@ -253,7 +290,7 @@ class AnalysisResponse(BaseModel):
     time_series: list[TimeSeriesPoint]
     nlp_insights: NLPInsights
     summary_text: str
-    sentiment_distribution: list[float] = Field(
+    sentiment_distribution: CompactFloats = Field(
         default_factory=list, description="All compound scores for histogram"
     )
     tribal_analysis: Optional[TribalAnalysis] = None
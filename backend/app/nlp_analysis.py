@@ -5,15 +5,17 @@ from __future__ import annotations
 import base64
 import io
 import logging
+import math
+import re
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-import textstat
-
 from .models import NamedEntity, NgramEntry, NLPInsights, TextStatistics
 from .text_preprocessor import (
     REDDIT_STOP_WORDS,
-    STOP_NGRAM_PHRASES,
+    STOP_NGRAMS,
     clean_text,
     filter_tokens,
     filter_entity_text,
@@ -21,9 +23,46 @@ from .text_preprocessor import (
 
 logger = logging.getLogger(__name__)
 
+# Regex stand-in for nltk.word_tokenize (Treebank rules) in n-gram counting.
+# Clitics split off their word ("company's" -> "company 's", "don't" ->
+# "do n't"), as do leading and trailing quotes and the fused forms Treebank
+# splits ("gonna" -> "gon na", "cannot" -> "can not"). Tokens then break on
+# whitespace and on the punctuation Treebank pads: brackets, quotes (curly
+# ones too, so "don’t" -> "don ’ t"), dashes, "--", ";@#$%&?!*", commas and
+# colons not before a digit, and periods that end a sentence or a run of
+# periods. Hyphens, slashes, apostrophes and inner periods stay inside the
+# token, which filter_tokens then drops as non-alphabetic ("and/or",
+# "r/vegan", "e.g"). scripts/check_ngram_tokenizer.py compares the result
+# with NLTK on the bundled samples.
+_PAD_CHARS = r"""\s.,:;@#$%&?!*()\[\]{}<>"«»“”‘’„`\u2012-\u2015"""
+_PAD_OR_END = r"(?=[" + _PAD_CHARS + r"]|$)"
+# Each split regex starts with a literal so re can skip straight to candidates
+_CLITIC_RE = re.compile(r"'(?<=[^\s']')((?:s|m|d|ll|re|ve|')?)" + _PAD_OR_END)
+_NOT_RE = re.compile(r"n't(?<=[^\s']n't)" + _PAD_OR_END)
+_OPEN_QUOTE_RE = re.compile(r"'(?<!\w')(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w)")
+_FUSED_RE = re.compile(
+    r"\b(can(?=not\b)|gon(?=na\b)|got(?=ta\b)|gim(?=me\b)|lem(?=me\b)|wan(?=na" + _PAD_OR_END + "))"
+)
+_TOKEN_RE = re.compile(
+    r"(?:[^" + _PAD_CHARS + r"]+|[,:](?=\d)"
+    r"|(?<!\.)\.(?![)\]}\"']*(?:\s|$)|[)\]}>\"'»”’]*$|\.))+"
+)
+
+
+def _tokenize(text: str) -> list[str]:
+    """Word tokens of ``text``, split like nltk.word_tokenize."""
+    text = text.replace("--", " -- ")
+    if "'" in text:
+        text = _OPEN_QUOTE_RE.sub("' ", _CLITIC_RE.sub(r" '\1", _NOT_RE.sub(" n't", text)))
+    return _TOKEN_RE.findall(_FUSED_RE.sub(r"\1 ", text))
+
+
 # Lazy-loaded spaCy model
 _nlp = None
 
+# Only NER is used; skipping the rest shrinks the loaded model and load time
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
 
 def _load_spacy():
     global _nlp
@@ -31,18 +70,42 @@ def _load_spacy():
         return
     import spacy
     try:
-        _nlp = spacy.load("en_core_web_md")
+        _nlp = spacy.load("en_core_web_md", exclude=SPACY_EXCLUDE)
     except OSError:
         logger.warning("en_core_web_md not found, falling back to en_core_web_sm")
         try:
-            _nlp = spacy.load("en_core_web_sm")
+            _nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
         except OSError:
             logger.error("No spaCy model found. Run: python -m spacy download en_core_web_md")
             raise
-    # Disable unneeded pipeline components for speed
     _nlp.max_length = 2_000_000
 
 
+def preload_spacy() -> None:
+    """Pre-load the spaCy model at startup (before any worker fork)."""
+    _load_spacy()
+
+
+# NLTK English stop words, loaded (and downloaded if missing) once per process
+_nltk_stop_words: Optional[frozenset[str]] = None
+
+
+def _english_stop_words() -> frozenset[str]:
+    global _nltk_stop_words
+    if _nltk_stop_words is not None:
+        return _nltk_stop_words
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        words = stopwords.words("english")
+    except LookupError:
+        nltk.download("stopwords", quiet=True)
+        words = stopwords.words("english")
+    _nltk_stop_words = frozenset(words)
+    return _nltk_stop_words
+
+
 def extract_entities(texts: list[str], top_n: int = 30) -> list[NamedEntity]:
     """Extract named entities from texts using spaCy."""
     _load_spacy()
@@ -68,41 +131,81 @@ def extract_entities(texts: list[str], top_n: int = 30) -> list[NamedEntity]:
 
 def compute_ngrams(texts: list[str], n: int = 2, top_k: int = 20) -> list[NgramEntry]:
     """Compute most common n-grams from texts."""
-    import nltk
-    from nltk.corpus import stopwords
+    return compute_ngrams_multi(texts, sizes=(n,), top_k=top_k)[n]
 
-    try:
-        stop_words = set(stopwords.words("english"))
-    except LookupError:
-        nltk.download("stopwords", quiet=True)
-        stop_words = set(stopwords.words("english"))
 
-    try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        nltk.download("punkt_tab", quiet=True)
-
-    ngram_counts: Counter = Counter()
+def compute_ngrams_multi(
+    texts: list[str],
+    sizes: tuple[int, ...] = (2, 3),
+    top_k: int = 20,
+) -> dict[int, list[NgramEntry]]:
+    """Compute the most common n-grams for several n from a single tokenization pass."""
+    stop_words = _english_stop_words()
+    ngram_counts: dict[int, Counter] = {n: Counter() for n in sizes}
 
     for text in texts:
-        text = clean_text(text).lower()
-        tokens = nltk.word_tokenize(text)
+        tokens = _tokenize(clean_text(text).lower())
         tokens = filter_tokens(tokens, extra_stopwords=stop_words)
 
-        grams = list(nltk.ngrams(tokens, n))
-        ngram_counts.update(grams)
+        # zip over shifted views feeds Counter's C counting loop directly
+        for n, counts in ngram_counts.items():
+            counts.update(zip(*(tokens[i:] for i in range(n))))
+
+    return {n: _top_ngrams(counts, top_k) for n, counts in ngram_counts.items()}
+
 
+def _top_ngrams(ngram_counts: Counter, top_k: int) -> list[NgramEntry]:
     # Filter out known boilerplate n-gram phrases
     results = []
     for gram, count in ngram_counts.most_common(top_k * 3):  # over-fetch to compensate for filtering
-        phrase = " ".join(gram)
-        if phrase not in STOP_NGRAM_PHRASES:
-            results.append(NgramEntry(text=phrase, count=count))
+        if gram not in STOP_NGRAMS:
+            results.append(NgramEntry(text=" ".join(gram), count=count))
             if len(results) >= top_k:
                 break
     return results
 
 
+# Flesch-Kincaid grade, counted and rounded the way textstat 0.7.4 does so
+# reading levels stay comparable with stored analyses: punctuation (apostrophes
+# included) is stripped, words split on whitespace, pyphen supplies syllables,
+# fragments of two words or fewer don't count as sentences, and both averages
+# are rounded to one decimal before the formula. Syllables are looked up once
+# per distinct word rather than once per occurrence.
+_FK_PUNCT_RE = re.compile(r"[^\w\s]")
+_FK_SENTENCE_RE = re.compile(r"\b[^.!?]+[.!?]*")
+_hyphenator = None
+
+
+def _fk_round(number: float) -> float:
+    """Round half away from zero to one decimal, as textstat does."""
+    return math.floor(number * 10 + math.copysign(0.5, number)) / 10
+
+
+def _fk_grade(text: str) -> float:
+    """Flesch-Kincaid grade level; falls back to textstat if no words are found."""
+    words = _FK_PUNCT_RE.sub("", text.lower()).split()
+    if not words:
+        import textstat
+        return textstat.flesch_kincaid_grade(text)
+
+    global _hyphenator
+    if _hyphenator is None:
+        from pyphen import Pyphen  # installed with textstat
+        _hyphenator = Pyphen(lang="en_US")
+
+    sentences = max(
+        sum(len(_FK_PUNCT_RE.sub("", s).split()) > 2 for s in _FK_SENTENCE_RE.findall(text)),
+        1,
+    )
+    syllables = sum(
+        count * (len(_hyphenator.positions(word)) + 1)
+        for word, count in Counter(words).items()
+    )
+    words_per_sentence = _fk_round(len(words) / sentences)
+    syllables_per_word = _fk_round(syllables / len(words))
+    return _fk_round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59)
+
+
 def compute_text_stats(
     post_texts: list[str],
     comment_texts: Optional[list[str]] = None,
@@ -128,7 +231,7 @@ def compute_text_stats(
 
     # Reading level (Flesch-Kincaid grade level)
     combined = " ".join(t for t in all_texts if t.strip())[:50000]
-    reading_level = textstat.flesch_kincaid_grade(combined) if combined else 0
+    reading_level = _fk_grade(combined) if combined else 0
 
     return TextStatistics(
         avg_post_length=round(avg_post_length, 1),
@@ -139,35 +242,51 @@ def compute_text_stats(
     )
 
 
-def generate_wordcloud_image(texts: list[str], max_words: int = 100, custom_stopwords: Optional[list[str]] = None) -> str:
-    """Generate a word cloud and return as base64-encoded PNG."""
-    from wordcloud import WordCloud, STOPWORDS
+# Shared WordCloud renderer: font and colormap setup happen once per process.
+# The instance is mutated per call (stop words, max_words), so renders are
+# serialized with a lock.
+_wordcloud = None
+_wordcloud_stopwords: frozenset[str] = frozenset()
+_wordcloud_lock = threading.Lock()
+
 
-    stopwords = set(STOPWORDS)
-    if custom_stopwords:
-        stopwords.update(custom_stopwords)
-    # Merge shared Reddit/web stop words so word cloud stays consistent
-    # with n-gram filtering
-    stopwords.update(REDDIT_STOP_WORDS)
+def _get_wordcloud():
+    global _wordcloud, _wordcloud_stopwords
+    if _wordcloud is None:
+        from wordcloud import WordCloud, STOPWORDS
 
+        # Merge shared Reddit/web stop words so word cloud stays consistent
+        # with n-gram filtering
+        _wordcloud_stopwords = frozenset(STOPWORDS) | REDDIT_STOP_WORDS
+        _wordcloud = WordCloud(
+            width=800,
+            height=400,
+            background_color="#F9F7F1",
+            colormap="Dark2",
+            contour_width=0,
+            margin=10,
+        )
+    return _wordcloud
+
+
+def generate_wordcloud_image(texts: list[str], max_words: int = 100, custom_stopwords: Optional[list[str]] = None) -> str:
+    """Generate a word cloud and return as base64-encoded PNG."""
     combined = " ".join(clean_text(t) for t in texts)
     if not combined.strip():
         return ""
 
-    wc = WordCloud(
-        width=800,
-        height=400,
-        max_words=max_words,
-        stopwords=stopwords,
-        background_color="#F9F7F1",
-        colormap="Dark2",
-        contour_width=0,
-        margin=10,
-    )
-    wc.generate(combined)
-
     buf = io.BytesIO()
-    wc.to_image().save(buf, format="PNG")
+    with _wordcloud_lock:
+        wc = _get_wordcloud()
+        stopwords = set(_wordcloud_stopwords)
+        if custom_stopwords:
+            stopwords.update(custom_stopwords)
+        wc.stopwords = stopwords
+        wc.max_words = max_words
+        wc.generate(combined)
+        image = wc.to_image()
+
+    image.save(buf, format="PNG")
     buf.seek(0)
     return base64.b64encode(buf.read()).decode("utf-8")
 
@@ -176,17 +295,22 @@ def run_full_nlp_analysis(
     post_texts: list[str],
     comment_texts: Optional[list[str]] = None,
 ) -> NLPInsights:
-    """Run all NLP analyses and return aggregated insights."""
-    all_texts = post_texts + (comment_texts or [])
+    """Run all NLP analyses and return aggregated insights.
 
-    entities = extract_entities(all_texts)
-    bigrams = compute_ngrams(all_texts, n=2)
-    trigrams = compute_ngrams(all_texts, n=3)
-    text_stats = compute_text_stats(post_texts, comment_texts)
+    The three stages share no state, so they run concurrently on a small
+    thread pool; spaCy and the regex engine release the GIL for much of it.
+    """
+    all_texts = post_texts + (comment_texts or [])
 
-    return NLPInsights(
-        entities=entities,
-        bigrams=bigrams,
-        trigrams=trigrams,
-        text_stats=text_stats,
-    )
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="nlp") as pool:
+        entities_f = pool.submit(extract_entities, all_texts)
+        ngrams_f = pool.submit(compute_ngrams_multi, all_texts, (2, 3))
+        stats_f = pool.submit(compute_text_stats, post_texts, comment_texts)
+        ngrams = ngrams_f.result()
+
+        return NLPInsights(
+            entities=entities_f.result(),
+            bigrams=ngrams[2],
+            trigrams=ngrams[3],
+            text_stats=stats_f.result(),
+        )
@@ -9,10 +9,21 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import tempfile
 import time
+from collections import deque
+from contextlib import contextmanager
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX: cache file is still replaced atomically
+    fcntl = None
+
 import httpx
+import ijson
+import orjson
+from cachetools import TTLCache
 
 from .models import RedditPost, RedditComment, SortMethod, TimeFilter
 
@@ -20,20 +31,143 @@ logger = logging.getLogger(__name__)
 
 USER_AGENT = "SubRedditSentimentAnalyzer/1.0 (research tool)"
 OAUTH_BASE_URL = "https://oauth.reddit.com"
-RATE_LIMIT_DELAY = 0.7  # seconds between requests (OAuth: 60 req/min)
+RATE_LIMIT_REQUESTS = 60  # OAuth: 60 requests ...
+RATE_LIMIT_PERIOD = 60.0  # ... per rolling minute
+COMMENT_FETCH_CONCURRENCY = 5  # in-flight comment requests per client
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL = 300  # 5 minutes
+# OAuth token persisted across restarts; set to an empty string to disable
+TOKEN_CACHE_PATH = os.environ.get("REDDIT_TOKEN_CACHE", "/tmp/reddit_token.json")
+
+
+# ── OAuth token cache ──────────────────────────────────────────────────────
+
+@contextmanager
+def _token_cache_lock(exclusive: bool):
+    if fcntl is None:
+        yield
+        return
+    with open(f"{TOKEN_CACHE_PATH}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_cached_token(client_id: str) -> Optional[tuple[str, float]]:
+    """Return a still-valid (token, expires) saved for this client id, if any."""
+    if not TOKEN_CACHE_PATH or not client_id:
+        return None
+    try:
+        with _token_cache_lock(exclusive=False):
+            with open(TOKEN_CACHE_PATH, "rb") as f:
+                data = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    # The file lives in a shared directory; anything not shaped like our own
+    # cache (stale format, another program's file) is just a miss.
+    if not isinstance(data, dict) or data.get("client_id") != client_id:
+        return None
+    token, expires = data.get("token"), data.get("expires")
+    if not isinstance(token, str) or not isinstance(expires, (int, float)) or isinstance(expires, bool):
+        return None
+    if time.time() >= expires:
+        return None
+    return token, float(expires)
+
+
+def _save_cached_token(client_id: str, token: str, expires: float) -> None:
+    """Atomically write the token cache (owner-readable only)."""
+    if not TOKEN_CACHE_PATH:
+        return
+    payload = orjson.dumps({"client_id": client_id, "token": token, "expires": expires})
+    try:
+        with _token_cache_lock(exclusive=True):
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(TOKEN_CACHE_PATH) or ".")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, TOKEN_CACHE_PATH)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+    except OSError as e:
+        logger.warning(f"Could not persist Reddit OAuth token: {e}")
+
+
+class AsyncTokenBucket:
+    """Sliding-window limiter: at most ``rate`` acquisitions per ``per`` seconds.
+
+    Also honours Reddit's X-Ratelimit-* headers: when the server reports no
+    remaining quota, acquisitions wait until its reset window elapses.
+    """
+
+    def __init__(self, rate: int = RATE_LIMIT_REQUESTS, per: float = RATE_LIMIT_PERIOD):
+        self._rate = rate
+        self._per = per
+        self._stamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+        self._blocked_until: float = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._blocked_until > now:
+                await asyncio.sleep(self._blocked_until - now)
+                now = time.monotonic()
+            while self._stamps and now - self._stamps[0] >= self._per:
+                self._stamps.popleft()
+            if len(self._stamps) >= self._rate:
+                await asyncio.sleep(self._stamps[0] + self._per - now)
+                self._stamps.popleft()
+                now = time.monotonic()
+            self._stamps.append(now)
+
+    def update_from_headers(self, headers: httpx.Headers) -> None:
+        """Pause until the server's reset time once its quota is exhausted."""
+        try:
+            remaining = float(headers["x-ratelimit-remaining"])
+            reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return
+        if remaining < 1:
+            logger.warning(f"Reddit rate limit exhausted, pausing {reset:.0f}s")
+            self._blocked_until = max(self._blocked_until, time.monotonic() + reset)
+
+
+class _AsyncByteReader:
+    """Async file-like adapter so ijson can consume an httpx byte stream."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes with read(0) to detect bytes vs str
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
 
 
 class RedditClient:
     """Fetches Reddit data via OAuth API."""
 
-    def __init__(self):
+    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None):
+        """Credentials default to REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET."""
         self._oauth_token: Optional[str] = None
         self._oauth_expires: float = 0
-        self._client_id: str = os.environ.get("REDDIT_CLIENT_ID", "")
-        self._client_secret: str = os.environ.get("REDDIT_CLIENT_SECRET", "")
+        self._client_id: str = client_id or os.environ.get("REDDIT_CLIENT_ID", "")
+        self._client_secret: str = client_secret or os.environ.get("REDDIT_CLIENT_SECRET", "")
+        cached_token = _load_cached_token(self._client_id)
+        if cached_token:
+            self._oauth_token, self._oauth_expires = cached_token
         self._proxy_url: Optional[str] = os.environ.get("REDDIT_PROXY_URL")
-        self._cache: dict[str, tuple[float, object]] = {}
-        self._cache_ttl = 300  # 5 minutes
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+        self._comment_semaphore = asyncio.Semaphore(COMMENT_FETCH_CONCURRENCY)
+        self._bucket = AsyncTokenBucket()
 
         if not self._client_id or not self._client_secret:
             logger.warning(
@@ -55,6 +189,25 @@ class RedditClient:
             headers["Authorization"] = f"Bearer {self._oauth_token}"
         return headers
 
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            proxy_kwargs = {"proxy": self._proxy_url} if self._proxy_url else {}
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                **proxy_kwargs,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def _authenticate(self) -> None:
         """Obtain OAuth token using client credentials (app-only auth)."""
         if not self.has_credentials:
@@ -62,48 +215,66 @@ class RedditClient:
                 "Reddit API credentials not configured. "
                 "Set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET environment variables."
             )
-        proxy_kwargs = {"proxy": self._proxy_url} if self._proxy_url else {}
-        async with httpx.AsyncClient(**proxy_kwargs) as client:
-            resp = await client.post(
-                "https://www.reddit.com/api/v1/access_token",
-                data={"grant_type": "client_credentials"},
-                auth=(self._client_id, self._client_secret),
-                headers={"User-Agent": USER_AGENT},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            self._oauth_token = data["access_token"]
-            self._oauth_expires = time.time() + data.get("expires_in", 3600) - 60
-            logger.info("Reddit OAuth authentication successful")
-
-    def _get_cache(self, key: str):
-        if key in self._cache:
-            ts, val = self._cache[key]
-            if time.time() - ts < self._cache_ttl:
-                return val
-            del self._cache[key]
-        return None
+        client = await self._get_client()
+        resp = await client.post(
+            "https://www.reddit.com/api/v1/access_token",
+            data={"grant_type": "client_credentials"},
+            auth=(self._client_id, self._client_secret),
+            headers={"User-Agent": USER_AGENT},
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        self._oauth_token = data["access_token"]
+        self._oauth_expires = time.time() + data.get("expires_in", 3600) - 60
+        _save_cached_token(self._client_id, self._oauth_token, self._oauth_expires)
+        logger.info("Reddit OAuth authentication successful")
 
-    def _set_cache(self, key: str, value):
-        self._cache[key] = (time.time(), value)
+    @staticmethod
+    def _cache_key(url: str, params: dict | None, *extra) -> tuple:
+        return (url, tuple(sorted(params.items())) if params else (), *extra)
 
     async def _get_json(self, url: str, params: dict | None = None) -> dict:
         """Make a rate-limited GET request and return JSON."""
-        cache_key = f"{url}:{params}"
-        cached = self._get_cache(cache_key)
+        cache_key = self._cache_key(url, params)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        await self._bucket.acquire()
+
+        if not self._is_authenticated:
+            await self._authenticate()
+
+        client = await self._get_client()
+        resp = await client.get(url, params=params, headers=self._headers())
+        self._bucket.update_from_headers(resp.headers)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        self._cache[cache_key] = data
+        return data
+
+    async def _stream_items(self, url: str, params: dict, prefix: str) -> list:
+        """Rate-limited GET that stream-parses the body, keeping only items at ``prefix``."""
+        cache_key = self._cache_key(url, params, prefix)
+        cached = self._cache.get(cache_key)
         if cached is not None:
             return cached
 
+        await self._bucket.acquire()
+
         if not self._is_authenticated:
             await self._authenticate()
 
-        proxy_kwargs = {"proxy": self._proxy_url} if self._proxy_url else {}
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True, **proxy_kwargs) as client:
-            resp = await client.get(url, params=params, headers=self._headers())
+        client = await self._get_client()
+        async with client.stream("GET", url, params=params, headers=self._headers()) as resp:
+            self._bucket.update_from_headers(resp.headers)
             resp.raise_for_status()
-            data = resp.json()
-            self._set_cache(cache_key, data)
-            return data
+            items = [
+                item async for item in
+                ijson.items(_AsyncByteReader(resp), prefix, use_float=True)
+            ]
+        self._cache[cache_key] = items
+        return items
 
     async def fetch_posts(
         self,
@@ -118,14 +289,16 @@ class RedditClient:
         after: Optional[str] = None
         fetched = 0
         batch_size = min(limit, 100)
+        append = posts.append
+
+        url = f"{OAUTH_BASE_URL}/r/{subreddit}/{sort.value}"
+        base_params: dict = {"raw_json": 1}
+        if sort == SortMethod.top:
+            base_params["t"] = time_filter.value
 
         while fetched < limit:
             this_batch = min(batch_size, limit - fetched)
-            url = f"{OAUTH_BASE_URL}/r/{subreddit}/{sort.value}"
-
-            params: dict = {"limit": this_batch, "raw_json": 1}
-            if sort == SortMethod.top:
-                params["t"] = time_filter.value
+            params = {**base_params, "limit": this_batch}
             if after:
                 params["after"] = after
 
@@ -148,7 +321,7 @@ class RedditClient:
 
             for child in children:
                 d = child.get("data", {})
-                posts.append(RedditPost(
+                append(RedditPost(
                     id=d.get("id", ""),
                     subreddit=subreddit,
                     title=d.get("title", ""),
@@ -170,8 +343,6 @@ class RedditClient:
             if not after or len(children) < this_batch:
                 break
 
-            await asyncio.sleep(RATE_LIMIT_DELAY)
-
         return posts[:limit]
 
     async def fetch_comments(
@@ -184,52 +355,59 @@ class RedditClient:
         url = f"{OAUTH_BASE_URL}/r/{subreddit}/comments/{post_id}"
         params = {"limit": 100, "depth": depth, "raw_json": 1}
 
+        # The response is [post_listing, comment_listing]; stream it and keep
+        # only the listing children rather than buffering the whole document.
+        # The post's own t3 child is dropped by _extract_comments.
         try:
-            data = await self._get_json(url, params)
+            children = await self._stream_items(url, params, "item.data.children.item")
         except Exception as e:
             logger.warning(f"Failed to fetch comments for post {post_id}: {e}")
             return []
 
         comments: list[RedditComment] = []
-        if isinstance(data, list) and len(data) > 1:
-            self._extract_comments(data[1], post_id, subreddit, comments, depth)
+        self._extract_comments(children, post_id, subreddit, comments, depth)
 
         return comments
 
     def _extract_comments(
         self,
-        listing: dict,
+        children: list[dict],
         post_id: str,
         subreddit: str,
         comments: list[RedditComment],
         max_depth: int,
-        current_depth: int = 0,
     ):
-        """Recursively extract comments from Reddit's nested structure."""
-        if current_depth >= max_depth:
+        """Extract comments from Reddit's nested structure, depth-first in thread order."""
+        if max_depth <= 0:
             return
 
-        children = listing.get("data", {}).get("children", [])
-        for child in children:
-            if child.get("kind") != "t1":
-                continue
-            d = child.get("data", {})
-            body = d.get("body", "")
-            if body and body != "[deleted]" and body != "[removed]":
-                comments.append(RedditComment(
-                    id=d.get("id", ""),
-                    post_id=post_id,
-                    subreddit=subreddit,
-                    body=body,
-                    author=d.get("author", "[deleted]"),
-                    score=d.get("score", 0),
-                    created_utc=d.get("created_utc", 0),
-                ))
-            replies = d.get("replies")
-            if isinstance(replies, dict):
-                self._extract_comments(
-                    replies, post_id, subreddit, comments, max_depth, current_depth + 1
-                )
+        append = comments.append
+        # Stack of (sibling iterator, depth); pushing a reply listing suspends
+        # its parent's iterator so output matches a recursive pre-order walk.
+        stack = [(iter(children), 0)]
+        while stack:
+            siblings, depth = stack[-1]
+            for child in siblings:
+                if child.get("kind") != "t1":
+                    continue
+                d = child["data"]
+                body = d.get("body", "")
+                if body and body != "[deleted]" and body != "[removed]":
+                    append(RedditComment(
+                        id=d.get("id", ""),
+                        post_id=post_id,
+                        subreddit=subreddit,
+                        body=body,
+                        author=d.get("author", "[deleted]"),
+                        score=d.get("score", 0),
+                        created_utc=d.get("created_utc", 0),
+                    ))
+                replies = d.get("replies")
+                if isinstance(replies, dict) and depth + 1 < max_depth:
+                    stack.append((iter(replies.get("data", {}).get("children", ())), depth + 1))
+                    break
+            else:
+                stack.pop()
 
     async def fetch_all(
         self,
@@ -248,19 +426,50 @@ class RedditClient:
 
         comments: list[RedditComment] = []
         if include_comments and posts:
-            for i, post in enumerate(posts):
-                post_comments = await self.fetch_comments(subreddit, post.id, comment_depth)
-                comments.extend(post_comments)
+            done = 0
 
+            async def _fetch_one(post: RedditPost) -> list[RedditComment]:
+                nonlocal done
+                async with self._comment_semaphore:
+                    post_comments = await self.fetch_comments(subreddit, post.id, comment_depth)
+                done += 1
                 if progress_callback:
-                    await progress_callback(
-                        i + 1, len(posts), subreddit, stage="comments"
-                    )
+                    await progress_callback(done, len(posts), subreddit, stage="comments")
+                return post_comments
 
-                await asyncio.sleep(RATE_LIMIT_DELAY)
+            # Requests overlap up to the semaphore size; the token bucket in
+            # _get_json keeps the overall request rate within Reddit's limit.
+            results = await asyncio.gather(*(_fetch_one(p) for p in posts))
+            comments = [c for post_comments in results for c in post_comments]
 
         return posts, comments
 
+    async def fetch_all_multi(
+        self,
+        subreddits: list[str],
+        sort: SortMethod,
+        time_filter: TimeFilter,
+        post_limit: int,
+        include_comments: bool,
+        comment_depth: int,
+        progress_callback=None,
+    ) -> list[tuple[list[RedditPost], list[RedditComment]] | BaseException]:
+        """Fetch several subreddits concurrently over the shared client and rate limiter.
+
+        Returns one entry per subreddit, in input order: its (posts, comments),
+        or the exception raised while fetching it.
+        """
+        return await asyncio.gather(
+            *(
+                self.fetch_all(
+                    sub, sort, time_filter, post_limit,
+                    include_comments, comment_depth, progress_callback,
+                )
+                for sub in subreddits
+            ),
+            return_exceptions=True,
+        )
+
 
 # Singleton instance
 reddit_client = RedditClient()
@@ -2,31 +2,92 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from typing import Optional
 
-import numpy as np
-from scipy.special import softmax
-
 from .models import SentimentLabel, SentimentResult
+from .text_preprocessor import unescape_html_entities
 
 logger = logging.getLogger(__name__)
 
 # Lazy-loaded globals
 _tokenizer = None
 _model = None
+_device = None
 _model_loading = False
 
+# Inference worker process (server only; scripts call analyze_batch directly)
+_pool: Optional[ProcessPoolExecutor] = None
+_worker_ready = False
+
 MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment-latest"
 
+# Inference precision: "auto" (fp16 on CUDA, fp32 on CPU), "float32",
+# "bfloat16", "float16" or "int8". bf16 only pays off on CPUs with
+# AMX/AVX512-BF16; int8 dynamically quantizes the Linear layers (CPU only,
+# slightly shifts scores, fastest on CPUs with VNNI).
+SENTIMENT_DTYPE = os.environ.get("SENTIMENT_DTYPE", "auto").lower()
+# Wrap the forward pass in torch.compile (slow first batch, faster after).
+SENTIMENT_COMPILE = os.environ.get("SENTIMENT_COMPILE", "").lower() in ("1", "true", "yes")
+
+# Max token-length difference within one batch before starting a new one.
+BUCKET_MAX_SPREAD = 32
+# Texts per forward pass. Length bucketing keeps padding low at any size, so
+# larger batches (e.g. 64 on a GPU) mostly just cut per-batch overhead.
+SENTIMENT_BATCH_SIZE = int(os.environ.get("SENTIMENT_BATCH_SIZE", "16"))
+
 # The model outputs 3 classes: negative (0), neutral (1), positive (2)
-LABEL_MAP = {0: SentimentLabel.negative, 1: SentimentLabel.neutral, 2: SentimentLabel.positive}
-COMPOUND_MAP = {SentimentLabel.negative: -1.0, SentimentLabel.neutral: 0.0, SentimentLabel.positive: 1.0}
+LABEL_MAP = {
+    0: SentimentLabel.negative.value,
+    1: SentimentLabel.neutral.value,
+    2: SentimentLabel.positive.value,
+}
+
+
+def _resolve_dtype(torch, device):
+    """Map SENTIMENT_DTYPE to a torch dtype supported on ``device``."""
+    if SENTIMENT_DTYPE == "auto":
+        return torch.float16 if device.type == "cuda" else torch.float32
+    if SENTIMENT_DTYPE == "int8":
+        # Weights load as fp32 and are quantized after loading
+        if device.type != "cpu":
+            logger.warning("int8 inference is CPU-only, using float16")
+            return torch.float16
+        return torch.float32
+    if SENTIMENT_DTYPE not in ("float32", "bfloat16", "float16"):
+        logger.warning(f"Unknown SENTIMENT_DTYPE={SENTIMENT_DTYPE!r}, using float32")
+        return torch.float32
+    if SENTIMENT_DTYPE == "float16" and device.type != "cuda":
+        logger.warning("float16 inference needs CUDA, using float32")
+        return torch.float32
+    if SENTIMENT_DTYPE == "bfloat16" and device.type == "cuda" and not torch.cuda.is_bf16_supported():
+        logger.warning("GPU lacks bfloat16 support, using float16")
+        return torch.float16
+    return getattr(torch, SENTIMENT_DTYPE)
+
+
+def _from_pretrained(cls, **kwargs):
+    """``cls.from_pretrained(MODEL_NAME)``, from the local HF cache if possible.
+
+    A cached model loads without any hub requests (every process start,
+    including each spawned worker, would otherwise re-check every file);
+    only a cache miss goes to the network.
+    """
+    try:
+        return cls.from_pretrained(MODEL_NAME, local_files_only=True, **kwargs)
+    except OSError:
+        return cls.from_pretrained(MODEL_NAME, **kwargs)
 
 
 def _load_model():
     """Lazy-load the sentiment model and tokenizer."""
-    global _tokenizer, _model, _model_loading
+    global _tokenizer, _model, _device, _model_loading
 
     if _tokenizer is not None and _model is not None:
         return
@@ -37,12 +98,31 @@ def _load_model():
     _model_loading = True
     logger.info(f"Loading sentiment model: {MODEL_NAME}")
 
+    # Let the Rust tokenizer use all cores; the model runs in a spawned (not
+    # forked) worker, so the usual fork-safety concern doesn't apply.
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
     try:
+        import torch
         from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
-        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-        _model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-        logger.info("Sentiment model loaded successfully")
+        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        dtype = _resolve_dtype(torch, _device)
+
+        _tokenizer = _from_pretrained(AutoTokenizer, use_fast=True)
+        _tokenizer.model_max_length = 512
+        model = _from_pretrained(AutoModelForSequenceClassification, torch_dtype=dtype)
+        model = model.to(_device).eval()
+        quantized = SENTIMENT_DTYPE == "int8" and _device.type == "cpu"
+        if quantized:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if SENTIMENT_COMPILE:
+            model = torch.compile(model, mode="reduce-overhead", dynamic=True)
+        _model = model
+        logger.info(
+            f"Sentiment model loaded successfully "
+            f"({_device}, {'int8' if quantized else dtype}, compile={SENTIMENT_COMPILE})"
+        )
     except Exception as e:
         logger.error(f"Failed to load sentiment model: {e}")
         raise
@@ -51,6 +131,8 @@ def _load_model():
 
 
 def is_model_loaded() -> bool:
+    if _pool is not None:
+        return _worker_ready
     return _tokenizer is not None and _model is not None
 
 
@@ -62,104 +144,194 @@ def preload_model() -> None:
 def _preprocess_text(text: str) -> str:
     """Clean text for the sentiment model."""
     # Truncate long text (model max is 512 tokens, ~300 words is safe)
-    text = text.strip()
-    if len(text) > 1500:
-        text = text[:1500]
+    text = text.strip()[:1500]
     # Replace Reddit-specific patterns
-    text = text.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
-    return text
+    return unescape_html_entities(text)
+
+
+# Cached for analyze_text only. Its keys are the raw, untruncated inputs, so
+# analyze_batch calls _preprocess_text directly: batch inputs are mostly
+# one-off texts that would churn the cache and pin long bodies in it.
+_preprocess_text_cached = lru_cache(maxsize=4096)(_preprocess_text)
+
+
+def _results_from_logits(logits) -> list[SentimentResult]:
+    """Build SentimentResults from a (batch, 3) logits tensor.
+
+    Softmax and argmax run in torch; the probabilities cross into Python once
+    via ``tolist()``. Uses ``model_construct`` to skip validation: the values
+    come straight from a softmax, so the label is always a valid
+    SentimentLabelValue and every probability (and P(positive) - P(negative))
+    is already within the field bounds. Only use this for model output, never
+    for client-supplied data.
+    """
+    import torch
+
+    probs = torch.softmax(logits.float(), dim=-1)
+    top_idx = probs.argmax(dim=-1).tolist()
+
+    results = []
+    for p, top in zip(probs.tolist(), top_idx):
+        neg, neu, pos = p
+        results.append(SentimentResult.model_construct(
+            label=LABEL_MAP[top],
+            confidence=p[top],
+            # Compound score: P(positive) - P(negative), i.e. label semantics
+            # negative=-1, neutral=0, positive=+1 weighted by probability
+            compound_score=round(pos - neg, 4),
+            scores={
+                "negative": round(neg, 4),
+                "neutral": round(neu, 4),
+                "positive": round(pos, 4),
+            },
+        ))
+    return results
 
 
 def analyze_text(text: str) -> Optional[SentimentResult]:
     """Analyze sentiment of a single text string."""
     _load_model()
 
-    text = _preprocess_text(text)
+    text = _preprocess_text_cached(text)
     if not text:
         return None
 
     try:
         import torch
 
-        encoded = _tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+        encoded = _tokenizer(
+            text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            return_token_type_ids=False,
+        ).to(_device, non_blocking=True)
         with torch.no_grad():
             output = _model(**encoded)
-        scores = output.logits[0].detach().numpy()
-        probs = softmax(scores)
-
-        # Determine top label
-        top_idx = int(np.argmax(probs))
-        label = LABEL_MAP[top_idx]
-        confidence = float(probs[top_idx])
-
-        # Compute compound score: weighted average using label semantics
-        # negative=-1, neutral=0, positive=+1, weighted by their probabilities
-        compound = float(probs[2] - probs[0])  # P(positive) - P(negative)
-
-        return SentimentResult(
-            label=label,
-            confidence=confidence,
-            compound_score=round(compound, 4),
-            scores={
-                "negative": round(float(probs[0]), 4),
-                "neutral": round(float(probs[1]), 4),
-                "positive": round(float(probs[2]), 4),
-            },
-        )
+        return _results_from_logits(output.logits)[0]
     except Exception as e:
         logger.warning(f"Sentiment analysis failed for text: {e}")
         return None
 
 
-def analyze_batch(texts: list[str], batch_size: int = 16) -> list[Optional[SentimentResult]]:
-    """Analyze sentiment of multiple texts in batches for efficiency."""
+def _length_buckets(order: list[int], lengths: list[int], batch_size: int) -> list[list[int]]:
+    """Split length-sorted indices into batches of similar token length."""
+    buckets: list[list[int]] = []
+    current: list[int] = []
+    for k in order:
+        if current and (
+            len(current) >= batch_size
+            or lengths[k] - lengths[current[0]] >= BUCKET_MAX_SPREAD
+        ):
+            buckets.append(current)
+            current = []
+        current.append(k)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def analyze_batch(texts: list[str], batch_size: int = SENTIMENT_BATCH_SIZE) -> list[Optional[SentimentResult]]:
+    """Analyze sentiment of multiple texts in batches for efficiency.
+
+    Duplicate texts (stock replies, bot messages) go through the model once.
+    Unique texts are tokenized once, sorted by token length and batched with
+    others of similar length, so a single long comment doesn't pad a whole
+    batch.
+    """
     _load_model()
     import torch
 
-    results: list[Optional[SentimentResult]] = []
-
-    for i in range(0, len(texts), batch_size):
-        batch_texts = [_preprocess_text(t) for t in texts[i : i + batch_size]]
-
-        # Handle empty texts
-        non_empty_indices = [j for j, t in enumerate(batch_texts) if t.strip()]
-        non_empty_texts = [batch_texts[j] for j in non_empty_indices]
-
-        batch_results: list[Optional[SentimentResult]] = [None] * len(batch_texts)
-
-        if non_empty_texts:
-            try:
-                encoded = _tokenizer(
-                    non_empty_texts,
-                    return_tensors="pt",
-                    truncation=True,
-                    max_length=512,
-                    padding=True,
-                )
-                with torch.no_grad():
-                    output = _model(**encoded)
-                all_scores = output.logits.detach().numpy()
-
-                for k, idx in enumerate(non_empty_indices):
-                    probs = softmax(all_scores[k])
-                    top_idx = int(np.argmax(probs))
-                    label = LABEL_MAP[top_idx]
-                    confidence = float(probs[top_idx])
-                    compound = float(probs[2] - probs[0])
-
-                    batch_results[idx] = SentimentResult(
-                        label=label,
-                        confidence=confidence,
-                        compound_score=round(compound, 4),
-                        scores={
-                            "negative": round(float(probs[0]), 4),
-                            "neutral": round(float(probs[1]), 4),
-                            "positive": round(float(probs[2]), 4),
-                        },
-                    )
-            except Exception as e:
-                logger.warning(f"Batch sentiment analysis failed: {e}")
-
-        results.extend(batch_results)
+    # One pass: preprocess, drop empties and map each input to its slot among
+    # the unique texts (-1 = empty). _preprocess_text already strips.
+    uniq: dict[str, int] = {}
+    slots = [
+        uniq.setdefault(t, len(uniq)) if t else -1
+        for t in map(_preprocess_text, texts)
+    ]
+    if not uniq:
+        return [None] * len(texts)
 
-    return results
+    unique_results: list[Optional[SentimentResult]] = [None] * len(uniq)
+
+    try:
+        encoded = _tokenizer(
+            list(uniq),
+            truncation=True,
+            max_length=512,
+            return_token_type_ids=False,
+        )
+    except Exception as e:
+        logger.warning(f"Batch sentiment tokenization failed: {e}")
+        return [None] * len(texts)
+
+    input_ids = encoded["input_ids"]
+    attention_mask = encoded["attention_mask"]
+    lengths = [len(ids) for ids in input_ids]
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+    for bucket in _length_buckets(order, lengths, batch_size):
+        try:
+            batch = _tokenizer.pad(
+                [{"input_ids": input_ids[k], "attention_mask": attention_mask[k]} for k in bucket],
+                padding="longest",
+                return_tensors="pt",
+            ).to(_device, non_blocking=True)
+            with torch.no_grad():
+                output = _model(**batch)
+            for k, result in zip(bucket, _results_from_logits(output.logits)):
+                unique_results[k] = result
+        except Exception as e:
+            logger.warning(f"Batch sentiment analysis failed: {e}")
+
+    return [unique_results[u] if u >= 0 else None for u in slots]
+
+
+def start_worker() -> None:
+    """Start the inference worker process, which loads the model on spawn.
+
+    The model then lives only in the worker, so tokenization and forward
+    passes never hold the server process's GIL.
+    """
+    global _pool
+    if _pool is not None:
+        return
+    _pool = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=preload_model,
+    )
+    _pool.submit(is_model_loaded).add_done_callback(_on_worker_started)
+
+
+def _on_worker_started(future) -> None:
+    global _worker_ready
+    try:
+        _worker_ready = future.result()
+        logger.info("Sentiment worker process ready")
+    except Exception as e:
+        logger.error(f"Sentiment worker failed to start (falling back to in-process): {e}")
+
+
+def shutdown_worker() -> None:
+    global _pool, _worker_ready
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _worker_ready = False
+
+
+async def analyze_batch_async(texts: list[str]) -> list[Optional[SentimentResult]]:
+    """Run analyze_batch in the worker process without blocking the event loop.
+
+    Falls back to a thread in this process if the worker isn't running or
+    has died (e.g. the model failed to load there).
+    """
+    loop = asyncio.get_running_loop()
+    if _pool is not None:
+        try:
+            return await loop.run_in_executor(_pool, analyze_batch, texts)
+        except BrokenProcessPool as e:
+            logger.error(f"Sentiment worker process died, running in-process: {e}")
+            shutdown_worker()
+    return await loop.run_in_executor(None, analyze_batch, texts)
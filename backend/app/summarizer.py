@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Optional
+import random
+import tempfile
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
 
 from .models import (
     SubredditSentimentSummary,
@@ -20,6 +35,23 @@ logger = logging.getLogger(__name__)
 
 # ── Gemini configuration ─────────────────────────────────────────────────
 
+GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+
+# Client-side limits, kept under the API quota so bursts queue instead of 429ing
+GEMINI_MAX_CONCURRENCY = 8
+GEMINI_RPM = 60
+GEMINI_TPM = 100_000
+GEMINI_MAX_ATTEMPTS = 3
+SAMPLE_TEXT_CHARS = 120  # per sample text quoted in the prompt
+TITLE_CHARS = 80  # per post title quoted in the template summary
+# Responses keyed by request hash; set GEMINI_CACHE_DIR to "" for memory-only
+GEMINI_CACHE_DIR = os.environ.get("GEMINI_CACHE_DIR", "/tmp/gemini-cache")
+GEMINI_CACHE_TTL = 7 * 24 * 3600  # 7 days
+GEMINI_CACHE_MAX_ENTRIES = 256
+# Disk cache cap; each save prunes expired files, then the oldest, down to it
+GEMINI_CACHE_MAX_BYTES = int(os.environ.get("GEMINI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
 GEMINI_SYSTEM_PROMPT = """\
 You are the editorial voice of a data-journalism tool that decodes online communities.
 
@@ -50,6 +82,90 @@ Do NOT start with "This community" — find a more compelling opening.
 """
 
 
+# Prompt templates, filled via str.format / format_map(vars(obj))
+_PROMPT_HEADER = (
+    "Community: {sub_str}\n"
+    "Dataset: {total_posts} posts, {total_comments} comments\n"
+    "Overall sentiment: mean={overall_mean:.3f}\n"
+)
+_TEXT_STATS_LINE = (
+    "Avg post length: {avg_post_length:.0f} words, "
+    "reading level: grade {reading_level:.1f}, "
+    "vocabulary richness: {vocabulary_richness:.3f}"
+)
+_SUBREDDIT_LINE = (
+    "r/{subreddit}: posts={post_count}, comments={comment_count}, "
+    "mean_sentiment={mean:.3f}, positive={positive_pct:.1f}%, "
+    "neutral={neutral_pct:.1f}%, negative={negative_pct:.1f}%"
+)
+_TOPIC_LINE = "  - {topic}: mean={mean_sentiment:+.3f}, mentions={mention_count}, std={std_dev:.3f}"
+_TRIBAL_SACRED_LINE = (
+    "  {topic}: sentiment={mean_sentiment:+.3f}, mentions={mention_count}, "
+    "consensus={consensus_score:.1f}"
+)
+_TRIBAL_BLASPHEMOUS_LINE = "  {topic}: sentiment={mean_sentiment:+.3f}, mentions={mention_count}"
+_TRIBAL_CONTROVERSIAL_LINE = (
+    "  {topic}: sentiment={mean_sentiment:+.3f}, std_dev={std_dev:.3f}, "
+    "mentions={mention_count}"
+)
+
+
+_TribalPartition = tuple[list[TribalTopic], list[TribalTopic], list[TribalTopic]]
+
+
+def _partition_tribal(topics: list[TribalTopic]) -> _TribalPartition:
+    """Split topics into (sacred, blasphemous, controversial) in one pass, keeping order.
+
+    Callers formatting the same topics more than once should partition once
+    and pass the result on via each builder's ``partition`` argument.
+    """
+    sacred: list[TribalTopic] = []
+    blasphemous: list[TribalTopic] = []
+    controversial: list[TribalTopic] = []
+    buckets = {
+        TribalClass.sacred: sacred,
+        TribalClass.blasphemous: blasphemous,
+        TribalClass.controversial: controversial,
+    }
+    for t in topics:
+        bucket = buckets.get(t.tribal_class)
+        if bucket is not None:
+            bucket.append(t)
+    return sacred, blasphemous, controversial
+
+
+_post_mean = attrgetter("post_stats.mean")
+
+
+def _compound_scores(posts: list[PostWithSentiment]) -> np.ndarray:
+    return np.fromiter(
+        (p.sentiment.compound_score for p in posts), dtype=np.float64, count=len(posts)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _SummaryCtx:
+    """Per-report aggregates shared by the Gemini prompt and the template fallback."""
+
+    scores: np.ndarray
+    overall_mean: float
+    total_posts: int
+    total_comments: int
+
+
+def _summary_ctx(
+    summaries: list[SubredditSentimentSummary],
+    posts: list[PostWithSentiment],
+) -> _SummaryCtx:
+    scores = _compound_scores(posts)
+    return _SummaryCtx(
+        scores=scores,
+        overall_mean=float(scores.mean()) if scores.size else 0.0,
+        total_posts=sum(s.post_count for s in summaries),
+        total_comments=sum(s.comment_count for s in summaries),
+    )
+
+
 def _build_gemini_prompt(
     subreddit_names: list[str],
     summaries: list[SubredditSentimentSummary],
@@ -58,29 +174,24 @@ def _build_gemini_prompt(
     insights: NLPInsights,
     tribal_topics: Optional[list[TribalTopic]] = None,
     ratioed_count: int = 0,
+    partition: Optional[_TribalPartition] = None,
+    ctx: Optional[_SummaryCtx] = None,
 ) -> str:
     """Build the user prompt with structured data for Gemini."""
-    sub_str = ", ".join(f"r/{s}" for s in subreddit_names)
-    total_posts = sum(s.post_count for s in summaries)
-    total_comments = sum(s.comment_count for s in summaries)
-
-    overall_scores = [p.sentiment.compound_score for p in posts]
-    overall_mean = sum(overall_scores) / max(len(overall_scores), 1)
-
+    ctx = ctx or _summary_ctx(summaries, posts)
     lines = [
-        f"Community: {sub_str}",
-        f"Dataset: {total_posts} posts, {total_comments} comments",
-        f"Overall sentiment: mean={overall_mean:.3f}",
-        "",
+        _PROMPT_HEADER.format(
+            sub_str=", ".join(f"r/{s}" for s in subreddit_names),
+            total_posts=ctx.total_posts,
+            total_comments=ctx.total_comments,
+            overall_mean=ctx.overall_mean,
+        )
     ]
 
     # Per-subreddit stats
-    for s in summaries:
-        lines.append(f"r/{s.subreddit}: posts={s.post_count}, comments={s.comment_count}, "
-                      f"mean_sentiment={s.post_stats.mean:.3f}, "
-                      f"positive={s.post_stats.positive_pct:.1f}%, "
-                      f"neutral={s.post_stats.neutral_pct:.1f}%, "
-                      f"negative={s.post_stats.negative_pct:.1f}%")
+    lines.extend(
+        _SUBREDDIT_LINE.format_map({**vars(s.post_stats), **vars(s)}) for s in summaries
+    )
 
     # Top entities
     if insights.entities:
@@ -94,74 +205,329 @@ def _build_gemini_prompt(
         lines.append("Top phrases: " + ", ".join(f'"{b.text}" ({b.count}x)' for b in top))
 
     # Text stats
-    stats = insights.text_stats
-    lines.append(f"Avg post length: {stats.avg_post_length:.0f} words, "
-                 f"reading level: grade {stats.reading_level:.1f}, "
-                 f"vocabulary richness: {stats.vocabulary_richness:.3f}")
+    lines.append(_TEXT_STATS_LINE.format_map(vars(insights.text_stats)))
 
     # Tribal analysis
     if tribal_topics:
-        sacred = [t for t in tribal_topics if t.tribal_class == TribalClass.sacred]
-        blasphemous = [t for t in tribal_topics if t.tribal_class == TribalClass.blasphemous]
-        controversial = [t for t in tribal_topics if t.tribal_class == TribalClass.controversial]
+        sacred, blasphemous, controversial = partition or _partition_tribal(tribal_topics)
 
         if sacred:
             lines.append("")
             lines.append("CELEBRATED topics (high positive consensus):")
-            for t in sacred[:5]:
-                lines.append(f"  - {t.topic}: mean={t.mean_sentiment:+.3f}, "
-                             f"mentions={t.mention_count}, std={t.std_dev:.3f}")
+            lines.extend(_TOPIC_LINE.format_map(vars(t)) for t in sacred[:5])
 
         if blasphemous:
             lines.append("REJECTED topics (high negative consensus):")
-            for t in blasphemous[:5]:
-                lines.append(f"  - {t.topic}: mean={t.mean_sentiment:+.3f}, "
-                             f"mentions={t.mention_count}, std={t.std_dev:.3f}")
+            lines.extend(_TOPIC_LINE.format_map(vars(t)) for t in blasphemous[:5])
 
         if controversial:
             lines.append("DIVISIVE topics (high disagreement):")
-            for t in controversial[:5]:
-                lines.append(f"  - {t.topic}: mean={t.mean_sentiment:+.3f}, "
-                             f"mentions={t.mention_count}, std={t.std_dev:.3f}")
+            lines.extend(_TOPIC_LINE.format_map(vars(t)) for t in controversial[:5])
 
         if ratioed_count:
             lines.append(f"\n{ratioed_count} ratioed posts (poster vs community sentiment mismatch)")
 
-    # Sample post titles by tribal class
-    if tribal_topics:
-        for cls_name, cls_val in [("Celebrated", TribalClass.sacred), ("Rejected", TribalClass.blasphemous)]:
-            cls_topics = [t for t in tribal_topics if t.tribal_class == cls_val]
+        # Sample post titles by tribal class
+        for cls_name, cls_topics in (("Celebrated", sacred), ("Rejected", blasphemous)):
             if cls_topics and cls_topics[0].sample_texts:
                 lines.append(f"\nSample {cls_name} content:")
                 for txt in cls_topics[0].sample_texts[:3]:
-                    lines.append(f'  "{txt[:120]}"')
+                    lines.append(f'  "{txt[:SAMPLE_TEXT_CHARS]}"')
 
     return "\n".join(lines)
 
 
-def _call_gemini(system_prompt: str, user_prompt: str) -> Optional[str]:
-    """Call Gemini API. Returns generated text or None on failure."""
+class _GeminiLimiter:
+    """RPM/TPM sliding windows plus an AIMD concurrency limit.
+
+    The concurrency limit halves on every 429 and grows by one per success,
+    up to ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+        rpm: int = GEMINI_RPM,
+        tpm: int = GEMINI_TPM,
+        window: float = 60.0,
+    ):
+        self._max_concurrency = max_concurrency
+        self._rpm = rpm
+        self._tpm = tpm
+        self._window = window
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._waiters: list[asyncio.Future] = []
+        self._requests: deque[list] = deque()  # [timestamp, tokens]
+        self._window_lock = asyncio.Lock()
+
+    async def acquire(self, est_tokens: int) -> list:
+        """Wait for window and concurrency capacity; returns a ticket for release()."""
+        async with self._window_lock:
+            while True:
+                now = time.monotonic()
+                while self._requests and now - self._requests[0][0] >= self._window:
+                    self._requests.popleft()
+                used = sum(tokens for _, tokens in self._requests)
+                if not self._requests or (
+                    len(self._requests) < self._rpm and used + est_tokens <= self._tpm
+                ):
+                    break
+                await asyncio.sleep(self._requests[0][0] + self._window - now)
+            ticket = [now, est_tokens]
+            self._requests.append(ticket)
+
+        while self._in_flight >= int(self._limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        return ticket
+
+    def release(self, ticket: list, total_tokens: Optional[int], throttled: bool) -> None:
+        """Record actual token usage and adjust the concurrency limit."""
+        if total_tokens is not None:
+            ticket[1] = total_tokens
+        self._in_flight -= 1
+        if throttled:
+            self._limit = max(1.0, self._limit / 2)
+            logger.warning(f"Gemini rate limited, concurrency limit now {int(self._limit)}")
+        else:
+            self._limit = min(float(self._max_concurrency), self._limit + 1)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+# Pooled HTTP/2 client and limiter, shared by all Gemini calls on the running
+# event loop
+_gemini_client: Optional[httpx.AsyncClient] = None
+_gemini_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_gemini_limiter: Optional[_GeminiLimiter] = None
+
+
+def _get_gemini_client() -> httpx.AsyncClient:
+    """Return the shared client, recreating it if the event loop changed.
+
+    Pooled connections can't be reused across loops, so each loop gets its
+    own. Scripts that call the async API through repeated asyncio.run() use
+    run_with_gemini_client, which closes the client before its loop ends.
+    """
+    global _gemini_client, _gemini_client_loop, _gemini_limiter
+    loop = asyncio.get_running_loop()
+    if _gemini_client is None or _gemini_client.is_closed or _gemini_client_loop is not loop:
+        _gemini_client = httpx.AsyncClient(
+            http2=True,
+            timeout=120,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+        _gemini_client_loop = loop
+        _gemini_limiter = _GeminiLimiter()
+    return _gemini_client
+
+
+async def _post_gemini(payload: bytes, api_key: str, est_tokens: int) -> dict:
+    """POST a serialized request body to Gemini under the limiter.
+
+    Retries 429/5xx and transport errors.
+    """
+    client = _get_gemini_client()
+    limiter = _gemini_limiter
+    headers = {"x-goog-api-key": api_key, "content-type": "application/json"}
+
+    for attempt in range(GEMINI_MAX_ATTEMPTS):
+        ticket = await limiter.acquire(est_tokens)
+        throttled = False
+        total_tokens = None
+        try:
+            resp = await client.post(GEMINI_URL, content=payload, headers=headers)
+            throttled = resp.status_code == 429
+            if not throttled and resp.status_code < 500:
+                resp.raise_for_status()
+                data = orjson.loads(resp.content)
+                total_tokens = data.get("usageMetadata", {}).get("totalTokenCount")
+                return data
+            error = f"HTTP {resp.status_code}"
+        except httpx.TransportError as e:
+            error = str(e) or type(e).__name__
+        finally:
+            limiter.release(ticket, total_tokens, throttled)
+
+        if attempt + 1 < GEMINI_MAX_ATTEMPTS:
+            delay = 2 ** attempt + random.random()
+            logger.warning(f"Gemini request failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    raise RuntimeError(f"Gemini request failed after {GEMINI_MAX_ATTEMPTS} attempts ({error})")
+
+
+# ── Response cache ────────────────────────────────────────────────────────
+
+_response_cache: TTLCache = TTLCache(maxsize=GEMINI_CACHE_MAX_ENTRIES, ttl=GEMINI_CACHE_TTL)
+
+
+def _response_cache_key(payload: bytes) -> str:
+    """Content hash of the model name and serialized request body."""
+    return hashlib.blake2b(GEMINI_MODEL.encode() + b"\x1e" + payload, digest_size=20).hexdigest()
+
+
+def _load_cached_response(key: str) -> Optional[str]:
+    """Return a cached response from memory, else from disk if not expired."""
+    text = _response_cache.get(key)
+    if text is not None or not GEMINI_CACHE_DIR:
+        return text
+    path = os.path.join(GEMINI_CACHE_DIR, key)
+    try:
+        if time.time() - os.path.getmtime(path) >= GEMINI_CACHE_TTL:
+            _remove_cache_file(path)
+            return None
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    _response_cache[key] = text
+    return text
+
+
+def _save_cached_response(key: str, text: str) -> None:
+    """Store a response in memory and atomically on disk."""
+    _response_cache[key] = text
+    if not GEMINI_CACHE_DIR:
+        return
+    try:
+        os.makedirs(GEMINI_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=GEMINI_CACHE_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, os.path.join(GEMINI_CACHE_DIR, key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not persist Gemini response: {e}")
+        return
+    _prune_disk_cache()
+
+
+def _remove_cache_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass  # already gone (another process pruned it) or not ours to delete
+
+
+def _prune_disk_cache() -> None:
+    """Delete expired cache files, then the oldest until under GEMINI_CACHE_MAX_BYTES."""
+    now = time.time()
+    files: list[tuple[float, int, str]] = []
+    total = 0
+    try:
+        with os.scandir(GEMINI_CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime >= GEMINI_CACHE_TTL:
+                    _remove_cache_file(entry.path)
+                    continue
+                files.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    except OSError as e:
+        logger.warning(f"Could not prune Gemini cache: {e}")
+        return
+    if total <= GEMINI_CACHE_MAX_BYTES:
+        return
+    files.sort()
+    for _, size, path in files:
+        _remove_cache_file(path)
+        total -= size
+        if total <= GEMINI_CACHE_MAX_BYTES:
+            break
+
+
+def _is_json(text: str) -> bool:
+    try:
+        orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return False
+    return True
+
+
+async def close_gemini_client() -> None:
+    global _gemini_client
+    if _gemini_client is not None:
+        await _gemini_client.aclose()
+        _gemini_client = None
+
+
+_T = TypeVar("_T")
+
+
+def run_with_gemini_client(coro: Coroutine[Any, Any, _T]) -> _T:
+    """asyncio.run(coro), closing the shared Gemini client before the loop ends.
+
+    For scripts: a client left open when its loop closes leaks its pooled
+    connections, and the next loop would otherwise replace it unclosed.
+    """
+    async def run() -> _T:
+        try:
+            return await coro
+        finally:
+            await close_gemini_client()
+
+    return asyncio.run(run())
+
+
+async def _call_gemini(
+    system_prompt: str,
+    user_prompt: str,
+    response_schema: Optional[dict] = None,
+) -> Optional[str]:
+    """Call Gemini API. Returns generated text or None on failure.
+
+    With ``response_schema`` the model is constrained to JSON matching it.
+    Successful responses are cached by request hash, so identical prompts
+    skip the network.
+    """
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         logger.info("GEMINI_API_KEY not set — falling back to template summary")
         return None
 
+    body = {
+        "systemInstruction": {"parts": [{"text": system_prompt}]},
+        "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+        "generationConfig": {"temperature": 0.7, "maxOutputTokens": 8192},
+    }
+    if response_schema is not None:
+        body["generationConfig"]["responseMimeType"] = "application/json"
+        body["generationConfig"]["responseSchema"] = response_schema
+
+    # Serialize once: the same bytes are hashed for the cache and sent
+    payload = orjson.dumps(body)
+    cache_key = _response_cache_key(payload)
+    cached = _load_cached_response(cache_key)
+    if cached is not None:
+        logger.info(f"Gemini cache hit ({cache_key[:12]})")
+        return cached
+
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(
-            "gemini-2.5-flash",
-            system_instruction=system_prompt,
-        )
-        response = model.generate_content(
-            user_prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.7,
-                max_output_tokens=8192,
-            ),
-        )
-        text = response.text.strip()
+        data = await _post_gemini(payload, api_key, (len(system_prompt) + len(user_prompt)) // 4)
+        parts = data["candidates"][0].get("content", {}).get("parts", [])
+        text = "".join(p.get("text", "") for p in parts if not p.get("thought")).strip()
         if text:
+            # Don't pin a malformed JSON reply for the cache lifetime
+            if response_schema is None or _is_json(text):
+                _save_cached_response(cache_key, text)
             return text
         logger.warning("Gemini returned empty response")
         return None
@@ -173,7 +539,52 @@ def _call_gemini(system_prompt: str, user_prompt: str) -> Optional[str]:
 # ── Public API ────────────────────────────────────────────────────────────
 
 
-def generate_summary(
+async def generate_summaries(
+    summaries: list[SubredditSentimentSummary],
+    posts: list[PostWithSentiment],
+    comments: list[CommentWithSentiment],
+    insights: NLPInsights,
+    tribal_topics: list[TribalTopic],
+    ratioed_posts: list[PostWithSentiment],
+) -> tuple[str, str]:
+    """Generate (summary_text, tribal_narrative) with a single Gemini request.
+
+    Each part falls back to its template if Gemini is unavailable or the
+    reply isn't the expected JSON object.
+    """
+    if not tribal_topics:
+        summary_text = await generate_summary(summaries, posts, comments, insights)
+        return summary_text, NO_TRIBAL_NARRATIVE
+
+    ctx = _summary_ctx(summaries, posts)
+    partition = _partition_tribal(tribal_topics)
+    editorial_input = _build_gemini_prompt(
+        [s.subreddit for s in summaries], summaries, posts, comments, insights,
+        tribal_topics, len(ratioed_posts), partition, ctx,
+    )
+    tribal_input = _build_tribal_prompt(tribal_topics, ratioed_posts, partition)
+    user_prompt = (
+        f"===EDITORIAL_INPUT===\n{editorial_input}\n\n"
+        f"===TRIBAL_INPUT===\n{tribal_input}"
+    )
+
+    editorial = tribal = None
+    raw = await _call_gemini(COMBINED_SYSTEM_PROMPT, user_prompt, COMBINED_RESPONSE_SCHEMA)
+    if raw:
+        try:
+            parsed = orjson.loads(raw)
+            editorial = parsed["editorial"].strip()
+            tribal = parsed["tribal"].strip()
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not parse combined Gemini response: {e}")
+
+    return (
+        editorial or _template_summary(summaries, posts, comments, insights, ctx),
+        tribal or _template_tribal_narrative(tribal_topics, ratioed_posts, partition),
+    )
+
+
+async def generate_summary(
     summaries: list[SubredditSentimentSummary],
     posts: list[PostWithSentiment],
     comments: list[CommentWithSentiment],
@@ -183,39 +594,46 @@ def generate_summary(
 ) -> str:
     """Generate an editorial synthesis — Gemini if available, else template."""
     subreddit_names = [s.subreddit for s in summaries]
+    ctx = _summary_ctx(summaries, posts)
 
     # Try Gemini first
     user_prompt = _build_gemini_prompt(
         subreddit_names, summaries, posts, comments, insights,
-        tribal_topics, ratioed_count,
+        tribal_topics, ratioed_count, ctx=ctx,
     )
-    gemini_result = _call_gemini(GEMINI_SYSTEM_PROMPT, user_prompt)
+    gemini_result = await _call_gemini(GEMINI_SYSTEM_PROMPT, user_prompt)
     if gemini_result:
         return gemini_result
 
     # Fallback: template-based summary
-    return _template_summary(summaries, posts, comments, insights)
+    return _template_summary(summaries, posts, comments, insights, ctx)
 
 
-def generate_tribal_narrative(
+async def generate_tribal_narrative(
     topics: list[TribalTopic],
     ratioed_posts: list[PostWithSentiment],
 ) -> str:
     """Generate tribal narrative — Gemini if available, else template."""
     if not topics:
-        return "Not enough data to identify tribal patterns in this community."
+        return NO_TRIBAL_NARRATIVE
+
+    partition = _partition_tribal(topics)
 
     # Try Gemini
-    gemini_result = _gemini_tribal_narrative(topics, ratioed_posts)
+    gemini_result = await _call_gemini(
+        TRIBAL_SYSTEM_PROMPT, _build_tribal_prompt(topics, ratioed_posts, partition)
+    )
     if gemini_result:
         return gemini_result
 
     # Fallback: template
-    return _template_tribal_narrative(topics, ratioed_posts)
+    return _template_tribal_narrative(topics, ratioed_posts, partition)
 
 
 # ── Gemini tribal narrative ──────────────────────────────────────────────
 
+NO_TRIBAL_NARRATIVE = "Not enough data to identify tribal patterns in this community."
+
 TRIBAL_SYSTEM_PROMPT = """\
 You are decoding the value structure of an online community. Given classified topics
 (Celebrated, Rejected, Divisive), write 1-2 paragraphs that reveal what this
@@ -227,58 +645,77 @@ Keep it under 150 words — dense and punchy.
 """
 
 
-def _gemini_tribal_narrative(
+def _build_tribal_prompt(
     topics: list[TribalTopic],
     ratioed_posts: list[PostWithSentiment],
-) -> Optional[str]:
-    """Generate tribal narrative via Gemini."""
-    sacred = [t for t in topics if t.tribal_class == TribalClass.sacred]
-    blasphemous = [t for t in topics if t.tribal_class == TribalClass.blasphemous]
-    controversial = [t for t in topics if t.tribal_class == TribalClass.controversial]
+    partition: Optional[_TribalPartition] = None,
+) -> str:
+    """Build the user prompt for the tribal narrative."""
+    sacred, blasphemous, controversial = partition or _partition_tribal(topics)
 
     lines = [f"Total topics classified: {len(topics)}", ""]
 
     if sacred:
         lines.append("CELEBRATED (community approves):")
-        for t in sacred[:5]:
-            lines.append(f"  {t.topic}: sentiment={t.mean_sentiment:+.3f}, "
-                         f"mentions={t.mention_count}, consensus={t.consensus_score:.1f}")
+        lines.extend(_TRIBAL_SACRED_LINE.format_map(vars(t)) for t in sacred[:5])
 
     if blasphemous:
         lines.append("REJECTED (community disapproves):")
-        for t in blasphemous[:5]:
-            lines.append(f"  {t.topic}: sentiment={t.mean_sentiment:+.3f}, "
-                         f"mentions={t.mention_count}")
+        lines.extend(_TRIBAL_BLASPHEMOUS_LINE.format_map(vars(t)) for t in blasphemous[:5])
 
     if controversial:
         lines.append("DIVISIVE (community split):")
-        for t in controversial[:5]:
-            lines.append(f"  {t.topic}: sentiment={t.mean_sentiment:+.3f}, "
-                         f"std_dev={t.std_dev:.3f}, mentions={t.mention_count}")
+        lines.extend(_TRIBAL_CONTROVERSIAL_LINE.format_map(vars(t)) for t in controversial[:5])
 
     if ratioed_posts:
         lines.append(f"\n{len(ratioed_posts)} posts where the community's response "
                      f"diverged from the poster's sentiment.")
 
-    return _call_gemini(TRIBAL_SYSTEM_PROMPT, "\n".join(lines))
+    return "\n".join(lines)
+
+
+# ── Gemini combined request ──────────────────────────────────────────────
+
+COMBINED_SYSTEM_PROMPT = f"""\
+You will write two pieces about the same Reddit community and return them as one
+JSON object with string fields "editorial" and "tribal". The user message holds
+the data for each under ===EDITORIAL_INPUT=== and ===TRIBAL_INPUT===.
+
+Instructions for "editorial":
+{GEMINI_SYSTEM_PROMPT}
+Instructions for "tribal":
+{TRIBAL_SYSTEM_PROMPT}"""
+
+COMBINED_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "editorial": {"type": "STRING"},
+        "tribal": {"type": "STRING"},
+    },
+    "required": ["editorial", "tribal"],
+    "propertyOrdering": ["editorial", "tribal"],
+}
 
 
 # ── Template fallbacks ───────────────────────────────────────────────────
 
 
+# Upper-exclusive bounds on the mean compound score for each descriptor.
+_DESCRIPTOR_BOUNDS = (-0.3, -0.1, 0.1, 0.3)
+_DESCRIPTORS = (
+    "strongly negative",
+    "moderately negative",
+    "relatively neutral",
+    "moderately positive",
+    "strongly positive",
+)
+
+
 def _sentiment_descriptor(mean: float) -> str:
-    if mean > 0.3:
-        return "strongly positive"
-    elif mean > 0.1:
-        return "moderately positive"
-    elif mean > -0.1:
-        return "relatively neutral"
-    elif mean > -0.3:
-        return "moderately negative"
-    else:
-        return "strongly negative"
+    return _DESCRIPTORS[bisect_left(_DESCRIPTOR_BOUNDS, mean)]
 
 
+@lru_cache(maxsize=1024)
 def _pct_fmt(v: float) -> str:
     return f"{v:.1f}%"
 
@@ -288,10 +725,12 @@ def _template_summary(
     posts: list[PostWithSentiment],
     comments: list[CommentWithSentiment],
     insights: NLPInsights,
+    ctx: Optional[_SummaryCtx] = None,
 ) -> str:
     """Original template-based summary generation."""
-    total_posts = sum(s.post_count for s in summaries)
-    total_comments = sum(s.comment_count for s in summaries)
+    ctx = ctx or _summary_ctx(summaries, posts)
+    total_posts = ctx.total_posts
+    total_comments = ctx.total_comments
     subreddit_names = [s.subreddit for s in summaries]
 
     # Paragraph 1: Overview
@@ -300,8 +739,8 @@ def _template_summary(
     else:
         sub_str = ", ".join(f"r/{s}" for s in subreddit_names[:-1]) + f" and r/{subreddit_names[-1]}"
 
-    overall_scores = [p.sentiment.compound_score for p in posts]
-    overall_mean = sum(overall_scores) / max(len(overall_scores), 1)
+    scores = ctx.scores
+    overall_mean = ctx.overall_mean
     desc = _sentiment_descriptor(overall_mean)
 
     para1 = (
@@ -347,9 +786,9 @@ def _template_summary(
     # Paragraph 3: Comparison or polarization
     para3 = ""
     if len(summaries) > 1:
-        sorted_subs = sorted(summaries, key=lambda s: s.post_stats.mean, reverse=True)
-        most_positive = sorted_subs[0]
-        most_negative = sorted_subs[-1]
+        most_positive = max(summaries, key=_post_mean)
+        # reversed() keeps the old sort's tie-break (last of equal minima)
+        most_negative = min(reversed(summaries), key=_post_mean)
         para3 = (
             f"Among the subreddits compared, r/{most_positive.subreddit} had the most positive sentiment "
             f"(mean score: {most_positive.post_stats.mean:.3f}), while r/{most_negative.subreddit} "
@@ -357,13 +796,13 @@ def _template_summary(
         )
     else:
         if posts:
-            most_pos = max(posts, key=lambda p: p.sentiment.compound_score)
-            most_neg = min(posts, key=lambda p: p.sentiment.compound_score)
+            most_pos = posts[int(scores.argmax())]
+            most_neg = posts[int(scores.argmin())]
             spread = most_pos.sentiment.compound_score - most_neg.sentiment.compound_score
             para3 = (
-                f"The most positive post (\"{most_pos.post.title[:80]}...\") "
+                f"The most positive post (\"{most_pos.post.title[:TITLE_CHARS]}...\") "
                 f"scored {most_pos.sentiment.compound_score:.3f}, while the most negative "
-                f"(\"{most_neg.post.title[:80]}...\") scored {most_neg.sentiment.compound_score:.3f}. "
+                f"(\"{most_neg.post.title[:TITLE_CHARS]}...\") scored {most_neg.sentiment.compound_score:.3f}. "
                 f"This spread of {spread:.3f} "
                 f"indicates {'significant polarization' if spread > 1.0 else 'moderate variation'} within the community."
             )
@@ -375,11 +814,10 @@ def _template_summary(
 def _template_tribal_narrative(
     topics: list[TribalTopic],
     ratioed_posts: list[PostWithSentiment],
+    partition: Optional[_TribalPartition] = None,
 ) -> str:
     """Original template-based tribal narrative."""
-    sacred = [t for t in topics if t.tribal_class == TribalClass.sacred]
-    blasphemous = [t for t in topics if t.tribal_class == TribalClass.blasphemous]
-    controversial = [t for t in topics if t.tribal_class == TribalClass.controversial]
+    sacred, blasphemous, controversial = partition or _partition_tribal(topics)
 
     parts: list[str] = []
 
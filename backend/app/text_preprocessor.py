@@ -7,12 +7,14 @@ entity extraction, n-gram, and keyword-sentiment pipelines stay consistent.
 from __future__ import annotations
 
 import re
+from collections.abc import Collection
+from functools import lru_cache
 
 # ── Shared Reddit / web stop words ───────────────────────────────────────
 # Used by n-gram extraction, word cloud generation, and entity filtering to
 # suppress Reddit boilerplate, common web jargon, and low-signal filler words.
 
-REDDIT_STOP_WORDS: set[str] = {
+REDDIT_STOP_WORDS: frozenset[str] = frozenset({
     # Reddit & web platform terms
     "https", "http", "www", "com", "reddit", "amp", "gt", "lt",
     "deleted", "removed", "edit", "update", "post", "comment",
@@ -45,11 +47,11 @@ REDDIT_STOP_WORDS: set[str] = {
     "someone", "anything", "everyone", "nothing", "everything",
     "yeah", "yes", "lol", "lmao", "im", "dont", "doesnt",
     "ive", "thats", "youre", "theyre", "isnt", "cant", "wont",
-}
+})
 
 # Multi-word n-gram phrases to suppress — Reddit moderation boilerplate and
 # platform noise that appear as bigrams/trigrams but carry no sentiment signal.
-STOP_NGRAM_PHRASES: set[str] = {
+STOP_NGRAM_PHRASES: frozenset[str] = frozenset({
     # Moderation / automod boilerplate
     "heavily reported", "auto moderator", "auto mod",
     "removed rule", "removed comment", "comment removed",
@@ -78,26 +80,57 @@ STOP_NGRAM_PHRASES: set[str] = {
     "feel like", "lot people", "pretty much", "make sure",
     "long time", "first time", "every time", "last time",
     "end day", "point view",
-}
+})
+
+# The same phrases as token tuples, so n-gram tuples can be checked before
+# they're joined into strings.
+STOP_NGRAMS: frozenset[tuple[str, ...]] = frozenset(
+    tuple(phrase.split()) for phrase in STOP_NGRAM_PHRASES
+)
+
+
+_URL_RE = re.compile(r"https?://\S+")
+# Markdown links and formatting characters, removed in one pass. URLs get their
+# own earlier pass: "[text](https://…)" must lose the URL (and its closing
+# paren) first, leaving the link text in place.
+_MARKDOWN_RE = re.compile(r"\[.*?\]\(.*?\)|[>#*_~`]")
+_HTML_ENTITY_RE = re.compile(r"&(?:amp|lt|gt);")
+_HTML_ENTITIES = {"&amp;": "&", "&lt;": "<", "&gt;": ">"}
+
+
+def _unescape_entity(match: re.Match) -> str:
+    return _HTML_ENTITIES[match.group(0)]
+
+
+def unescape_html_entities(text: str) -> str:
+    """Decode the &amp; / &lt; / &gt; entities Reddit leaves in text."""
+    return _HTML_ENTITY_RE.sub(_unescape_entity, text)
 
 
 def clean_text(text: str) -> str:
     """Basic cleaning for NLP processing (strips URLs, markdown, HTML entities)."""
-    text = re.sub(r"https?://\S+", "", text)
-    text = re.sub(r"\[.*?\]\(.*?\)", "", text)  # Markdown links
-    text = re.sub(r"[>#*_~`]", "", text)        # Markdown formatting
-    text = text.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
-    return text.strip()
+    text = _MARKDOWN_RE.sub("", _URL_RE.sub("", text))
+    return unescape_html_entities(text).strip()
+
+
+@lru_cache(maxsize=8)
+def _combined_stopwords(extra: frozenset[str]) -> frozenset[str]:
+    return REDDIT_STOP_WORDS | extra
 
 
-def filter_tokens(tokens: list[str], extra_stopwords: set[str] | None = None) -> list[str]:
+def filter_tokens(tokens: list[str], extra_stopwords: Collection[str] | None = None) -> list[str]:
     """Return alphabetic tokens longer than 2 chars that are not stop words.
 
     Merges REDDIT_STOP_WORDS with *extra_stopwords* (e.g. NLTK English stop
-    words) so callers don't need to do the union themselves.
+    words) so callers don't need to do the union themselves. The union is
+    cached per distinct stop-word set; pass a frozenset to skip the copy.
     """
-    combined = REDDIT_STOP_WORDS | (extra_stopwords or set())
-    return [t for t in tokens if t.isalpha() and len(t) > 2 and t not in combined]
+    if not isinstance(extra_stopwords, frozenset):
+        extra_stopwords = frozenset(extra_stopwords or ())
+    is_stop = _combined_stopwords(extra_stopwords).__contains__
+    # Cheapest rejections first: most short tokens and stop words never
+    # reach the isalpha() scan.
+    return [t for t in tokens if len(t) > 2 and not is_stop(t) and t.isalpha()]
 
 
 def filter_entity_text(text: str) -> bool:
@@ -6,10 +6,13 @@ based on sentiment statistics. Also provides multi-term concept search.
 
 from __future__ import annotations
 
-import statistics
-from collections import defaultdict
+from bisect import bisect_left
+from collections.abc import Callable
 from typing import Optional
 
+import ahocorasick
+import numpy as np
+
 from .models import (
     CommentWithSentiment,
     ContextSnippet,
@@ -23,6 +26,57 @@ from .models import (
 )
 
 
+# ── Search corpus ─────────────────────────────────────────────────────────
+
+
+# Label -> bincount slot; SentimentLabel members hash like their str values
+_LABEL_INDEX = {
+    SentimentLabel.positive: 0,
+    SentimentLabel.neutral: 1,
+    SentimentLabel.negative: 2,
+}
+
+
+class AnalysisCorpus:
+    """An analysis's posts and comments with their lowercased search texts.
+
+    Build once per analysis and reuse it for topic grouping and every
+    concept search, so texts aren't lowercased again per request.
+    ``texts``, ``scores`` and ``label_codes`` are flat columns over the
+    posts followed by the comments, so a search reads plain arrays instead
+    of pydantic attributes.
+    """
+
+    __slots__ = (
+        "posts", "comments", "post_texts", "comment_texts",
+        "texts", "scores", "label_codes", "_snippets",
+    )
+
+    def __init__(self, posts: list[PostWithSentiment], comments: list[CommentWithSentiment]):
+        self.posts = posts
+        self.comments = comments
+        self.post_texts = [f"{p.post.title} {p.post.selftext}".lower() for p in posts]
+        self.comment_texts = [c.comment.body.lower() for c in comments]
+
+        self.texts = self.post_texts + self.comment_texts
+        sentiments = [p.sentiment for p in posts] + [c.sentiment for c in comments]
+        n = len(sentiments)
+        self.scores = np.fromiter((s.compound_score for s in sentiments), dtype=np.float64, count=n)
+        self.label_codes = np.fromiter((_LABEL_INDEX[s.label] for s in sentiments), dtype=np.intp, count=n)
+        self._snippets: dict[int, ContextSnippet] = {}
+
+    def snippet(self, i: int) -> ContextSnippet:
+        """Concept-search snippet for item ``i`` of the flat columns.
+
+        Built on first use and shared by later searches; snippets are
+        never mutated after construction.
+        """
+        snippet = self._snippets.get(i)
+        if snippet is None:
+            snippet = self._snippets[i] = _build_snippet(self, i)
+        return snippet
+
+
 # ── Topic grouping ────────────────────────────────────────────────────────
 
 
@@ -32,6 +86,7 @@ def build_topic_groups(
     entities: list[NamedEntity],
     bigrams: list[NgramEntry],
     top_n: int = 20,
+    corpus: Optional[AnalysisCorpus] = None,
 ) -> list[dict]:
     """Build topic groups from NER entities and top bigrams.
 
@@ -39,7 +94,8 @@ def build_topic_groups(
       1. NER entities filtered to ORG, PERSON, GPE, PRODUCT
       2. Top bigrams (often better topics than NER on Reddit text)
 
-    Deduplicates overlapping topics and collects compound scores.
+    Deduplicates overlapping topics and collects compound scores. Pass a
+    prebuilt ``corpus`` of the same posts and comments to reuse its texts.
     """
     # Collect candidate topic strings (deduplicated, case-normalized)
     seen_lower: set[str] = set()
@@ -55,64 +111,146 @@ def build_topic_groups(
                 candidates.append(ent.text.strip())
 
     # Source 2: Top bigrams
+    # Seen keys joined by NUL (absent from topic text), so "is key inside any
+    # seen key" is a single substring scan instead of one per seen key.
+    seen_text = "\x00".join(seen_lower)
     for bg in bigrams[:top_n]:
         key = bg.text.lower().strip()
         # Skip if already covered by an entity (substring match)
         if key in seen_lower:
             continue
-        if any(key in s or s in key for s in seen_lower):
+        if key in seen_text or any(map(key.__contains__, seen_lower)):
             continue
         if bg.count >= 3:
             seen_lower.add(key)
+            seen_text += "\x00" + key
             candidates.append(bg.text.strip())
 
     # Cap total candidates
     candidates = candidates[:top_n]
+    if not candidates:
+        return []
 
-    # Build text corpus for fast searching
-    post_data = []
-    for p in posts:
-        text = f"{p.post.title} {p.post.selftext}".lower()
-        post_data.append((text, p.sentiment.compound_score, p.post.title[:120]))
-
-    comment_data = []
-    for c in comments:
-        text = c.comment.body.lower()
-        comment_data.append((text, c.sentiment.compound_score, c.comment.body[:120]))
+    # One automaton over all candidates, so each text is scanned once for
+    # every topic (overlapping matches included) instead of once per topic.
+    # Candidates are unique after lowercasing, so no key is overwritten.
+    automaton = ahocorasick.Automaton()
+    for idx, topic in enumerate(candidates):
+        automaton.add_word(topic.lower(), idx)
+    automaton.make_automaton()
+
+    # Record (topic, text) hit pairs instead of per-topic score lists; the
+    # scores come from the corpus's flat column when the stats are reduced.
+    corpus = corpus or AnalysisCorpus(posts, comments)
+    hit_topics: list[int] = []
+    hit_texts: list[int] = []
+    for i, text in enumerate(corpus.texts):
+        found = {idx for _, idx in automaton.iter(text)}
+        if found:
+            hit_topics.extend(found)
+            hit_texts.extend([i] * len(found))
+
+    topics = np.array(hit_topics, dtype=np.intp)
+    texts = np.array(hit_texts, dtype=np.intp)
+    counts, means, stds = _topic_stats(topics, corpus.scores[texts], len(candidates))
+
+    # Sample texts are each topic's first three hits, picked once here rather
+    # than checked on every hit. A stable sort by topic keeps text order.
+    texts_by_topic = texts[np.argsort(topics, kind="stable")].tolist()
+    start = 0
 
-    # For each candidate topic, find mentions and collect scores
     groups: list[dict] = []
-    for topic in candidates:
-        topic_lower = topic.lower()
-        scores: list[float] = []
-        sample_texts: list[str] = []
-
-        for text, score, snippet in post_data:
-            if topic_lower in text:
-                scores.append(score)
-                if len(sample_texts) < 3:
-                    sample_texts.append(snippet)
-
-        for text, score, snippet in comment_data:
-            if topic_lower in text:
-                scores.append(score)
-                if len(sample_texts) < 3:
-                    sample_texts.append(snippet)
-
-        if len(scores) >= 3:  # Minimum mentions to be meaningful
+    for idx, topic in enumerate(candidates):
+        count = counts[idx]
+        if count >= 3:  # Minimum mentions to be meaningful
             groups.append({
                 "topic": topic,
-                "compound_scores": scores,
-                "mention_count": len(scores),
-                "sample_texts": sample_texts,
+                "mean": means[idx],
+                "std": stds[idx],
+                "mention_count": count,
+                "sample_texts": [_sample_text(corpus, i) for i in texts_by_topic[start:start + 3]],
             })
+        start += count
 
     return groups
 
 
+def _sample_text(corpus: AnalysisCorpus, i: int) -> str:
+    """Topic sample for item ``i`` of the corpus's posts-then-comments columns."""
+    n_posts = len(corpus.posts)
+    if i < n_posts:
+        return corpus.posts[i].post.title[:120]
+    return corpus.comments[i - n_posts].comment.body[:120]
+
+
+def _topic_stats(
+    topics: np.ndarray, scores: np.ndarray, n_topics: int,
+) -> tuple[list[int], list[float], list[float]]:
+    """Mention count, mean and sample std dev (0.0 for one score) per topic.
+
+    ``topics[k]`` is the topic of ``scores[k]``. Everything is reduced with
+    bincount, and squared deviations are taken from each topic's mean
+    (two-pass, not E[x^2] - E[x]^2). Topics without scores get zeros.
+    """
+    counts = np.bincount(topics, minlength=n_topics)
+    means = np.bincount(topics, weights=scores, minlength=n_topics) / np.maximum(counts, 1)
+    sq_dev = np.bincount(topics, weights=(scores - means[topics]) ** 2, minlength=n_topics)
+    stds = np.sqrt(sq_dev / np.maximum(counts - 1, 1))
+    return counts.tolist(), means.tolist(), stds.tolist()
+
+
 # ── Tribalism classification ──────────────────────────────────────────────
 
 
+# np.select codes for classify_tribalism, in rule-priority order
+_CLASS_BY_CODE = (
+    TribalClass.controversial,
+    TribalClass.sacred,
+    TribalClass.blasphemous,
+    TribalClass.neutral,
+)
+# Output rank per code: sacred, blasphemous, controversial, then neutral
+_RANK_BY_CODE = np.array([2, 0, 1, 3])
+
+
+def _classify_codes(means: np.ndarray, stds: np.ndarray) -> np.ndarray:
+    """Class code (index into _CLASS_BY_CODE) per topic from rounded stats.
+
+    Pure array kernel: one boolean mask per rule, first match wins
+    (np.select mirrors an if/elif chain).
+    """
+    n = len(means)
+    if n >= 8:
+        # Percentile-based: top/bottom 15% by mean, top 15% by std
+        cutoff = max(1, int(n * 0.15))
+
+        # Rank the rounded values with stable argsorts, so tied topics are
+        # picked in input order (argpartition would pick arbitrarily).
+        idx_by_mean = np.argsort(means, kind="stable")
+        idx_by_std = np.argsort(-stds, kind="stable")
+
+        blasphemous = np.zeros(n, dtype=bool)
+        blasphemous[idx_by_mean[:cutoff]] = True
+        sacred = np.zeros(n, dtype=bool)
+        sacred[idx_by_mean[-cutoff:]] = True
+        controversial = np.zeros(n, dtype=bool)
+        controversial[idx_by_std[:cutoff]] = True
+
+        conditions = [
+            controversial & (stds > 0.2),
+            sacred & (means > 0.05),
+            blasphemous & (means < -0.05),
+        ]
+    else:
+        # Absolute thresholds for small topic sets
+        conditions = [
+            stds > 0.6,
+            (means > 0.5) & (stds < 0.3),
+            (means < -0.5) & (stds < 0.3),
+        ]
+    return np.select(conditions, [0, 1, 2], default=3)
+
+
 def classify_tribalism(topic_groups: list[dict]) -> list[TribalTopic]:
     """Classify topics as Sacred, Blasphemous, Controversial, or Neutral.
 
@@ -122,76 +260,34 @@ def classify_tribalism(topic_groups: list[dict]) -> list[TribalTopic]:
     if not topic_groups:
         return []
 
-    # Compute stats per topic
-    enriched = []
-    for g in topic_groups:
-        scores = g["compound_scores"]
-        mean = statistics.mean(scores)
-        std = statistics.stdev(scores) if len(scores) > 1 else 0.0
-        enriched.append({
-            **g,
-            "mean_sentiment": round(mean, 4),
-            "std_dev": round(std, 4),
-            "consensus_score": round(1.0 / max(std, 0.05), 2),
-        })
-
-    # Classification
-    if len(enriched) >= 8:
-        # Percentile-based: top/bottom 15% by mean, top 15% by std
-        sorted_by_mean = sorted(enriched, key=lambda x: x["mean_sentiment"])
-        sorted_by_std = sorted(enriched, key=lambda x: x["std_dev"], reverse=True)
+    # Classification works on the rounded per-topic stats
+    stds = [g["std"] for g in topic_groups]
+    rounded_means = [round(g["mean"], 4) for g in topic_groups]
+    rounded_stds = [round(s, 4) for s in stds]
+    class_codes = _classify_codes(np.array(rounded_means), np.array(rounded_stds))
 
-        n = len(enriched)
-        cutoff = max(1, int(n * 0.15))
-
-        blasphemous_set = {id(t) for t in sorted_by_mean[:cutoff]}
-        sacred_set = {id(t) for t in sorted_by_mean[-cutoff:]}
-        controversial_set = {id(t) for t in sorted_by_std[:cutoff]}
-
-        for t in enriched:
-            tid = id(t)
-            if tid in controversial_set and t["std_dev"] > 0.2:
-                t["tribal_class"] = TribalClass.controversial
-            elif tid in sacred_set and t["mean_sentiment"] > 0.05:
-                t["tribal_class"] = TribalClass.sacred
-            elif tid in blasphemous_set and t["mean_sentiment"] < -0.05:
-                t["tribal_class"] = TribalClass.blasphemous
-            else:
-                t["tribal_class"] = TribalClass.neutral
-    else:
-        # Absolute thresholds for small topic sets
-        for t in enriched:
-            if t["std_dev"] > 0.6:
-                t["tribal_class"] = TribalClass.controversial
-            elif t["mean_sentiment"] > 0.5 and t["std_dev"] < 0.3:
-                t["tribal_class"] = TribalClass.sacred
-            elif t["mean_sentiment"] < -0.5 and t["std_dev"] < 0.3:
-                t["tribal_class"] = TribalClass.blasphemous
-            else:
-                t["tribal_class"] = TribalClass.neutral
+    # Order: non-neutral first (most interesting), then by mention count.
+    # lexsort is stable and its last key is the primary one.
+    mention_counts = np.fromiter(
+        (g["mention_count"] for g in topic_groups), dtype=np.int64, count=len(topic_groups),
+    )
+    order = np.lexsort((-mention_counts, _RANK_BY_CODE[class_codes]))
 
     # Build TribalTopic objects
+    codes = class_codes.tolist()
     results = []
-    for t in enriched:
+    for i in order.tolist():
+        g = topic_groups[i]
         results.append(TribalTopic(
-            topic=t["topic"],
-            tribal_class=t["tribal_class"],
-            mean_sentiment=t["mean_sentiment"],
-            std_dev=t["std_dev"],
-            consensus_score=t["consensus_score"],
-            mention_count=t["mention_count"],
-            sample_texts=t["sample_texts"],
+            topic=g["topic"],
+            tribal_class=_CLASS_BY_CODE[codes[i]],
+            mean_sentiment=rounded_means[i],
+            std_dev=rounded_stds[i],
+            consensus_score=round(1.0 / max(stds[i], 0.05), 2),
+            mention_count=g["mention_count"],
+            sample_texts=g["sample_texts"],
         ))
 
-    # Sort: non-neutral first (most interesting), then by mention count
-    class_order = {
-        TribalClass.sacred: 0,
-        TribalClass.blasphemous: 1,
-        TribalClass.controversial: 2,
-        TribalClass.neutral: 3,
-    }
-    results.sort(key=lambda t: (class_order.get(t.tribal_class, 9), -t.mention_count))
-
     return results
 
 
@@ -211,17 +307,20 @@ def classify_ratioed_posts(
     if not comments:
         return []
 
-    # Group comments by post_id
-    comments_by_post: dict[str, list[float]] = defaultdict(list)
-    for c in comments:
-        comments_by_post[c.comment.post_id].append(c.sentiment.compound_score)
+    # Mean comment score per post_id: one unique/bincount pass over all comments
+    post_ids = np.array([c.comment.post_id for c in comments])
+    scores = np.fromiter(
+        (c.sentiment.compound_score for c in comments), dtype=np.float64, count=len(comments)
+    )
+    ids, inverse, counts = np.unique(post_ids, return_inverse=True, return_counts=True)
+    means = np.bincount(inverse, weights=scores) / counts
+    avg_comment_by_post = dict(zip(ids.tolist(), means.tolist()))
 
     ratioed: list[PostWithSentiment] = []
     for p in posts:
-        post_comments = comments_by_post.get(p.post.id)
-        if not post_comments:
+        avg_comment = avg_comment_by_post.get(p.post.id)
+        if avg_comment is None:
             continue
-        avg_comment = statistics.mean(post_comments)
         delta = p.sentiment.compound_score - avg_comment
         if delta > threshold:
             ratioed.append(p)
@@ -231,12 +330,49 @@ def classify_ratioed_posts(
 
 # ── Concept search ────────────────────────────────────────────────────────
 
+def _term_matcher(terms: list[str]) -> Callable[[str], bool]:
+    """Predicate: does a lowercased text contain any of ``terms``?
 
-def concept_search(
-    posts: list[PostWithSentiment],
-    comments: list[CommentWithSentiment],
-    query: str,
-) -> dict:
+    Terms containing another term are dropped (any text they match, the
+    shorter term matches too), and a single remaining term is tested with a
+    bare ``in``. str.__contains__ outruns both a regex alternation and an
+    Aho-Corasick automaton at the handful of terms a query has.
+    """
+    unique = sorted(set(terms), key=len)
+    needed: list[str] = []
+    for term in unique:
+        if not any(shorter in term for shorter in needed):
+            needed.append(term)
+
+    if len(needed) == 1:
+        (term,) = needed
+        return lambda text: term in text
+    return lambda text: any(map(text.__contains__, needed))
+
+
+def _build_snippet(corpus: AnalysisCorpus, i: int) -> ContextSnippet:
+    """Snippet for item ``i`` of the corpus's flat posts-then-comments columns."""
+    n_posts = len(corpus.posts)
+    if i < n_posts:
+        p = corpus.posts[i]
+        return ContextSnippet(
+            text=p.post.title[:150],
+            sentiment_score=p.sentiment.compound_score,
+            sentiment_label=p.sentiment.label,
+            source_type="post",
+            post_title=p.post.title[:100],
+            permalink=f"https://reddit.com{p.post.permalink}",
+        )
+    c = corpus.comments[i - n_posts]
+    return ContextSnippet(
+        text=c.comment.body[:150],
+        sentiment_score=c.sentiment.compound_score,
+        sentiment_label=c.sentiment.label,
+        source_type="comment",
+    )
+
+
+def concept_search(corpus: AnalysisCorpus, query: str) -> dict:
     """Multi-term concept search across posts and comments.
 
     Splits query on commas. Matches if ANY term appears (case-insensitive).
@@ -254,57 +390,32 @@ def concept_search(
             "snippets": [],
         }
 
-    matching_posts: list[PostWithSentiment] = []
-    matching_comments: list[CommentWithSentiment] = []
-    scores: list[float] = []
-    labels: list[SentimentLabel] = []
-    snippets: list[ContextSnippet] = []
-
-    for p in posts:
-        text = f"{p.post.title} {p.post.selftext}".lower()
-        if any(term in text for term in terms):
-            matching_posts.append(p)
-            scores.append(p.sentiment.compound_score)
-            labels.append(p.sentiment.label)
-            if len(snippets) < 5:
-                snippets.append(ContextSnippet(
-                    text=p.post.title[:150],
-                    sentiment_score=p.sentiment.compound_score,
-                    sentiment_label=p.sentiment.label.value,
-                    source_type="post",
-                    post_title=p.post.title[:100],
-                    permalink=f"https://reddit.com{p.post.permalink}",
-                ))
-
-    for c in comments:
-        if any(term in c.comment.body.lower() for term in terms):
-            matching_comments.append(c)
-            scores.append(c.sentiment.compound_score)
-            labels.append(c.sentiment.label)
-            if len(snippets) < 5:
-                snippets.append(ContextSnippet(
-                    text=c.comment.body[:150],
-                    sentiment_score=c.sentiment.compound_score,
-                    sentiment_label=c.sentiment.label.value,
-                    source_type="comment",
-                ))
+    # One pass over the flat texts column; indices below len(posts) are posts
+    matches = _term_matcher(terms)
+    hits = [i for i, text in enumerate(corpus.texts) if matches(text)]
+    post_hit_count = bisect_left(hits, len(corpus.posts))
+    snippets = [corpus.snippet(i) for i in hits[:5]]
 
     # Compute stats
     stats: Optional[SentimentStats] = None
     topic: Optional[TribalTopic] = None
 
-    if scores:
-        total = len(labels)
-        mean = statistics.mean(scores)
-        std = statistics.stdev(scores) if len(scores) > 1 else 0.0
+    if hits:
+        total = len(hits)
+        arr = corpus.scores[hits]
+        mean = float(arr.mean())
+        std = float(arr.std(ddof=1)) if total > 1 else 0.0
+        positive_pct, neutral_pct, negative_pct = (
+            np.bincount(corpus.label_codes[hits], minlength=3) / total * 100
+        ).tolist()
 
         stats = SentimentStats(
             mean=round(mean, 4),
-            median=round(statistics.median(scores), 4),
+            median=round(float(np.median(arr)), 4),
             std_dev=round(std, 4),
-            positive_pct=round(labels.count(SentimentLabel.positive) / total * 100, 1),
-            neutral_pct=round(labels.count(SentimentLabel.neutral) / total * 100, 1),
-            negative_pct=round(labels.count(SentimentLabel.negative) / total * 100, 1),
+            positive_pct=round(positive_pct, 1),
+            neutral_pct=round(neutral_pct, 1),
+            negative_pct=round(negative_pct, 1),
             total_count=total,
         )
 
@@ -324,15 +435,15 @@ def concept_search(
             mean_sentiment=round(mean, 4),
             std_dev=round(std, 4),
             consensus_score=round(1.0 / max(std, 0.05), 2),
-            mention_count=len(scores),
+            mention_count=total,
             sample_texts=[s.text for s in snippets[:3]],
         )
 
     return {
         "query": query,
         "terms": terms,
-        "matching_post_count": len(matching_posts),
-        "matching_comment_count": len(matching_comments),
+        "matching_post_count": post_hit_count,
+        "matching_comment_count": len(hits) - post_hit_count,
         "stats": stats,
         "topic": topic,
         "snippets": snippets,
@@ -0,0 +1,29 @@
+"""Tests for text statistics in nlp_analysis."""
+
+import unittest
+from pathlib import Path
+
+import orjson
+
+from app import nlp_analysis
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "samples"
+
+
+class ReadingLevelTests(unittest.TestCase):
+    def test_matches_stored_sample_analyses(self):
+        """Reading levels match the textstat values stored with each sample."""
+        paths = sorted(SAMPLES_DIR.glob("*.analysis.json"))
+        self.assertTrue(paths)
+        for path in paths:
+            with self.subTest(sample=path.name):
+                data = orjson.loads(path.with_name(path.name.replace(".analysis", "")).read_bytes())
+                post_texts = [f"{p['title']} {p.get('selftext', '')}" for p in data["posts"]]
+                comment_texts = [c["body"] for c in data.get("comments", [])]
+                stored = orjson.loads(path.read_bytes())["nlp_insights"]["text_stats"]
+                stats = nlp_analysis.compute_text_stats(post_texts, comment_texts)
+                self.assertEqual(stats.reading_level, stored["reading_level"])
+
+
+if __name__ == "__main__":
+    unittest.main()
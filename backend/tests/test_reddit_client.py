@@ -0,0 +1,62 @@
+"""Tests for the on-disk Reddit OAuth token cache."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import orjson
+
+from app import reddit_client
+
+
+class LoadCachedTokenTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "reddit_token.json")
+        patcher = mock.patch.object(reddit_client, "TOKEN_CACHE_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, raw: bytes) -> None:
+        with open(self.path, "wb") as f:
+            f.write(raw)
+
+    def test_valid_cache_is_returned(self):
+        expires = time.time() + 3600
+        reddit_client._save_cached_token("abc", "tok", expires)
+        self.assertEqual(reddit_client._load_cached_token("abc"), ("tok", expires))
+
+    def test_other_client_or_expired_is_a_miss(self):
+        reddit_client._save_cached_token("abc", "tok", time.time() + 3600)
+        self.assertIsNone(reddit_client._load_cached_token("other"))
+        reddit_client._save_cached_token("abc", "tok", time.time() - 1)
+        self.assertIsNone(reddit_client._load_cached_token("abc"))
+
+    def test_malformed_cache_is_a_miss(self):
+        future = time.time() + 3600
+        cases = [
+            b"not json",
+            b"[1, 2]",
+            b'"abc"',
+            b"null",
+            orjson.dumps({"client_id": "abc", "expires": future}),
+            orjson.dumps({"client_id": "abc", "token": "tok"}),
+            orjson.dumps({"client_id": "abc", "token": 123, "expires": future}),
+            orjson.dumps({"client_id": "abc", "token": "tok", "expires": "soon"}),
+            orjson.dumps({"client_id": "abc", "token": "tok", "expires": True}),
+        ]
+        for raw in cases:
+            with self.subTest(raw=raw):
+                self.write(raw)
+                self.assertIsNone(reddit_client._load_cached_token("abc"))
+
+    def test_malformed_cache_does_not_break_client_init(self):
+        self.write(b"[1, 2]")
+        reddit_client.RedditClient(client_id="abc", client_secret="secret")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for the on-disk Gemini response cache."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from app import summarizer
+
+
+class DiskCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        for patcher in (
+            mock.patch.object(summarizer, "GEMINI_CACHE_DIR", self.dir),
+            mock.patch.object(summarizer, "_response_cache", {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def age(self, key: str, seconds: float) -> None:
+        path = os.path.join(self.dir, key)
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_round_trip(self):
+        summarizer._save_cached_response("k", "text")
+        summarizer._response_cache.clear()
+        self.assertEqual(summarizer._load_cached_response("k"), "text")
+
+    def test_expired_file_is_deleted_on_read(self):
+        summarizer._save_cached_response("k", "text")
+        summarizer._response_cache.clear()
+        self.age("k", summarizer.GEMINI_CACHE_TTL + 1)
+        self.assertIsNone(summarizer._load_cached_response("k"))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "k")))
+
+    def test_save_prunes_oldest_above_max_bytes(self):
+        with mock.patch.object(summarizer, "GEMINI_CACHE_MAX_BYTES", 250):
+            for i in range(3):
+                summarizer._save_cached_response(f"k{i}", "x" * 100)
+                self.age(f"k{i}", 100 - i)  # k0 oldest
+        self.assertEqual(sorted(os.listdir(self.dir)), ["k1", "k2"])
+
+    def test_save_prunes_expired_files(self):
+        summarizer._save_cached_response("old", "text")
+        self.age("old", summarizer.GEMINI_CACHE_TTL + 1)
+        summarizer._save_cached_response("new", "text")
+        self.assertEqual(os.listdir(self.dir), ["new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,7 +40,7 @@ export interface SentimentResult {
   label: SentimentLabel;
   confidence: number;
   compound_score: number;
-  scores: Record<string, number>;
+  scores: Record<string, number> | null;
 }
 
 export interface PostWithSentiment {
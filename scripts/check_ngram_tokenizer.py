@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Check that n-gram counting still tokenizes like nltk.word_tokenize.
+
+compute_ngrams_multi uses a regex stand-in for NLTK's Treebank tokenizer.
+This recounts the bigrams and trigrams of every bundled sample with
+NLTKWordTokenizer (run per sentence, as word_tokenize does) and fails if the
+top n-grams differ from compute_ngrams_multi's. Run it after touching the
+token regexes in nlp_analysis.py.
+
+Usage:
+    python scripts/check_ngram_tokenizer.py                     # all samples
+    python scripts/check_ngram_tokenizer.py --subreddit vegan   # one sample
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+import orjson
+from nltk.tokenize import NLTKWordTokenizer
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.nlp_analysis import _english_stop_words, _top_ngrams, compute_ngrams_multi
+from backend.app.text_preprocessor import clean_text, filter_tokens
+
+SAMPLES_DIR = PROJECT_ROOT / "backend" / "samples"
+
+SIZES = (2, 3)
+TOP_K = 20
+
+# Where punkt ends a sentence after an ordinary word: sentence punctuation,
+# any straight closing quotes/brackets, then whitespace. word_tokenize splits
+# the final period off each sentence, so the reference needs the same breaks.
+_SENTENCE_END_RE = re.compile(r"([.!?][)\]}\"']*)\s+")
+
+_treebank = NLTKWordTokenizer()
+
+
+def _nltk_tokenize(text: str) -> list[str]:
+    sentences = _SENTENCE_END_RE.sub("\\1\0", text).split("\0")
+    return [token for sentence in sentences for token in _treebank.tokenize(sentence)]
+
+
+def _nltk_ngrams(texts: list[str]) -> dict:
+    stop_words = _english_stop_words()
+    ngram_counts: dict[int, Counter] = {n: Counter() for n in SIZES}
+    for text in texts:
+        tokens = filter_tokens(_nltk_tokenize(clean_text(text).lower()), extra_stopwords=stop_words)
+        for n, counts in ngram_counts.items():
+            counts.update(zip(*(tokens[i:] for i in range(n))))
+    return {n: _top_ngrams(counts, TOP_K) for n, counts in ngram_counts.items()}
+
+
+def check_sample(sample_path: Path) -> bool:
+    """Compare both tokenizations of one sample; print and return whether they match."""
+    data = orjson.loads(sample_path.read_bytes())
+    texts = [f"{p['title']} {p.get('selftext', '')}" for p in data["posts"]]
+    texts += [c["body"] for c in data.get("comments", [])]
+
+    expected = _nltk_ngrams(texts)
+    actual = compute_ngrams_multi(texts, SIZES, TOP_K)
+
+    ok = True
+    for n in SIZES:
+        want = [(e.text, e.count) for e in expected[n]]
+        got = [(e.text, e.count) for e in actual[n]]
+        if want != got:
+            ok = False
+            print(f"  {sample_path.stem}: top {n}-grams differ")
+            print(f"    nltk:  {want}")
+            print(f"    regex: {got}")
+    if ok:
+        print(f"  {sample_path.stem}: ok ({len(texts)} texts)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare n-gram tokenization against NLTK")
+    parser.add_argument("--subreddit", type=str, help="Check a single subreddit")
+    args = parser.parse_args()
+
+    if args.subreddit:
+        path = SAMPLES_DIR / f"{args.subreddit.lower()}.json"
+        if not path.exists():
+            print(f"Sample not found: {path}")
+            raise SystemExit(1)
+        paths = [path]
+    else:
+        paths = sorted(
+            p for p in SAMPLES_DIR.glob("*.json")
+            if not p.name.endswith(".analysis.json")
+        )
+
+    results = [check_sample(path) for path in paths]
+    if not all(results):
+        raise SystemExit(1)
+    print(f"\nAll {len(paths)} samples match.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Fetch sample Reddit data for featured communities.
 
-Standalone script — only requires `requests` (no ML dependencies).
+Standalone script — only requires `httpx` and `orjson` (no ML dependencies).
 Run from a residential IP (Reddit blocks cloud/datacenter IPs).
 
 Usage:
@@ -12,12 +12,14 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import time
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 
-import requests
+import httpx
+import orjson
 
 SAMPLES_DIR = Path(__file__).resolve().parent.parent / "backend" / "samples"
 USER_AGENT = "Undercurrent/2.0 (sample data fetcher)"
@@ -40,26 +42,71 @@ SUBREDDITS = [
     {"name": "Android",            "limit": 200, "sort": "top", "time": "week",  "depth": 2, "description": "Android ecosystem identity — customization, openness, and value"},
 ]
 
-RATE_LIMIT = 2.0  # seconds between requests
-
-
-def _get(url: str, params: dict | None = None, retries: int = 3) -> dict:
-    """GET with rate limiting and retry on 429."""
+RATE_LIMIT_REQUESTS = 30  # requests ...
+RATE_LIMIT_PERIOD = 60.0  # ... per rolling minute (same volume as one every 2s)
+COMMENT_CONCURRENCY = 5  # comment pages in flight at once
+
+
+class RateLimiter:
+    """Sliding-window limiter: at most ``rate`` requests per ``per`` seconds.
+
+    A 429 pauses every caller until its Retry-After has elapsed.
+    """
+
+    def __init__(self, rate: int = RATE_LIMIT_REQUESTS, per: float = RATE_LIMIT_PERIOD):
+        self._rate = rate
+        self._per = per
+        self._stamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+        self._blocked_until: float = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._blocked_until > now:
+                await asyncio.sleep(self._blocked_until - now)
+                now = time.monotonic()
+            while self._stamps and now - self._stamps[0] >= self._per:
+                self._stamps.popleft()
+            if len(self._stamps) >= self._rate:
+                await asyncio.sleep(self._stamps[0] + self._per - now)
+                self._stamps.popleft()
+                now = time.monotonic()
+            self._stamps.append(now)
+
+    def pause(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+async def _get(
+    client: httpx.AsyncClient,
+    limiter: RateLimiter,
+    url: str,
+    params: dict | None = None,
+    retries: int = 3,
+) -> dict | list:
+    """GET with rate limiting and retry on 429; decodes the body with orjson."""
     for attempt in range(retries):
-        time.sleep(RATE_LIMIT)
-        headers = {"User-Agent": USER_AGENT}
-        resp = requests.get(url, params=params, headers=headers, timeout=30)
+        await limiter.acquire()
+        resp = await client.get(url, params=params)
         if resp.status_code == 429:
             wait = int(resp.headers.get("Retry-After", 10))
             print(f"  Rate limited, waiting {wait}s...")
-            time.sleep(wait)
+            limiter.pause(wait)
             continue
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
     raise RuntimeError(f"Failed after {retries} retries: {url}")
 
 
-def fetch_posts(subreddit: str, sort: str, time_filter: str, limit: int) -> list[dict]:
+async def fetch_posts(
+    client: httpx.AsyncClient,
+    limiter: RateLimiter,
+    subreddit: str,
+    sort: str,
+    time_filter: str,
+    limit: int,
+) -> list[dict]:
     """Fetch posts from Reddit's public JSON API."""
     posts = []
     after = None
@@ -71,7 +118,7 @@ def fetch_posts(subreddit: str, sort: str, time_filter: str, limit: int) -> list
             params["after"] = after
 
         url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
-        data = _get(url, params)
+        data = await _get(client, limiter, url, params)
 
         children = data.get("data", {}).get("children", [])
         if not children:
@@ -99,13 +146,19 @@ def fetch_posts(subreddit: str, sort: str, time_filter: str, limit: int) -> list
     return posts[:limit]
 
 
-def fetch_comments(subreddit: str, post_id: str, depth: int = 2) -> list[dict]:
+async def fetch_comments(
+    client: httpx.AsyncClient,
+    limiter: RateLimiter,
+    subreddit: str,
+    post_id: str,
+    depth: int = 2,
+) -> list[dict]:
     """Fetch comments for a single post."""
     url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}.json"
     params = {"depth": depth, "limit": 50, "raw_json": 1}
 
     try:
-        data = _get(url, params)
+        data = await _get(client, limiter, url, params)
     except Exception as e:
         print(f"    Warning: failed to fetch comments for {post_id}: {e}")
         return []
@@ -114,49 +167,58 @@ def fetch_comments(subreddit: str, post_id: str, depth: int = 2) -> list[dict]:
     if len(data) < 2:
         return comments
 
-    def _walk(children):
-        for child in children:
-            if child.get("kind") != "t1":
-                continue
-            d = child["data"]
-            comments.append({
-                "id": d["id"],
-                "post_id": post_id,
-                "subreddit": d.get("subreddit", subreddit),
-                "body": d.get("body", ""),
-                "author": d.get("author", "[deleted]"),
-                "score": d.get("score", 0),
-                "created_utc": d.get("created_utc", 0),
-            })
-            replies = d.get("replies")
-            if isinstance(replies, dict):
-                _walk(replies.get("data", {}).get("children", []))
+    # Depth-first in thread order: siblings are pushed reversed, so popping
+    # yields the same pre-order a recursive walk would, without recursion.
+    stack = list(reversed(data[1].get("data", {}).get("children", [])))
+    while stack:
+        child = stack.pop()
+        if child.get("kind") != "t1":
+            continue
+        d = child["data"]
+        comments.append({
+            "id": d["id"],
+            "post_id": post_id,
+            "subreddit": d.get("subreddit", subreddit),
+            "body": d.get("body", ""),
+            "author": d.get("author", "[deleted]"),
+            "score": d.get("score", 0),
+            "created_utc": d.get("created_utc", 0),
+        })
+        replies = d.get("replies")
+        if isinstance(replies, dict):
+            stack.extend(reversed(replies.get("data", {}).get("children", [])))
 
-    _walk(data[1].get("data", {}).get("children", []))
     return comments
 
 
-def fetch_subreddit(config: dict) -> dict:
+async def fetch_subreddit(client: httpx.AsyncClient, limiter: RateLimiter, config: dict) -> dict:
     """Fetch all data for one subreddit."""
     name = config["name"]
     print(f"\n{'='*60}")
     print(f"Fetching r/{name} - {config['limit']} posts, sort={config['sort']}, t={config['time']}")
     print(f"{'='*60}")
 
-    posts = fetch_posts(name, config["sort"], config["time"], config["limit"])
+    posts = await fetch_posts(client, limiter, name, config["sort"], config["time"], config["limit"])
     print(f"  Got {len(posts)} posts")
 
-    all_comments = []
-    # Fetch comments for top posts (by score)
+    # Fetch comments for top posts (by score), several pages in flight at once
     sorted_posts = sorted(posts, key=lambda p: p["score"], reverse=True)
     comment_posts = sorted_posts[:min(50, len(sorted_posts))]
+    semaphore = asyncio.Semaphore(COMMENT_CONCURRENCY)
 
-    for i, post in enumerate(comment_posts):
+    async def fetch_post_comments(i: int, post: dict) -> list[dict]:
+        async with semaphore:
+            comments = await fetch_comments(client, limiter, name, post["id"], depth=config["depth"])
         title_safe = post['title'][:60].encode('ascii', errors='replace').decode('ascii')
-        print(f"  Fetching comments for post {i+1}/{len(comment_posts)}: {title_safe}...")
-        comments = fetch_comments(name, post["id"], depth=config["depth"])
+        print(f"  Post {i+1}/{len(comment_posts)}: {len(comments)} comments — {title_safe}")
+        return comments
+
+    # gather keeps results in post order
+    all_comments = []
+    for comments in await asyncio.gather(
+        *(fetch_post_comments(i, post) for i, post in enumerate(comment_posts))
+    ):
         all_comments.extend(comments)
-        print(f"    Got {len(comments)} comments")
 
     print(f"  Total: {len(posts)} posts, {len(all_comments)} comments")
 
@@ -190,6 +252,25 @@ def _get_configs(subreddit: str | None) -> list[dict]:
     return SUBREDDITS
 
 
+async def fetch_all(configs: list[dict]) -> None:
+    """Fetch and save each subreddit over one shared client and rate limit."""
+    limiter = RateLimiter()
+    async with httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        timeout=30,
+    ) as client:
+        for config in configs:
+            try:
+                result = await fetch_subreddit(client, limiter, config)
+                out_path = SAMPLES_DIR / f"{config['name'].lower()}.json"
+                with open(out_path, "wb") as f:
+                    f.write(orjson.dumps(result))
+                print(f"  Saved to {out_path}")
+            except Exception as e:
+                print(f"  ERROR fetching r/{config['name']}: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch sample Reddit data")
     parser.add_argument("--subreddit", type=str, help="Fetch a single subreddit by name")
@@ -203,15 +284,7 @@ def main():
     print(f"Saving samples to: {SAMPLES_DIR}")
     print(f"Fetching {len(configs)} subreddit(s)...")
 
-    for config in configs:
-        try:
-            result = fetch_subreddit(config)
-            out_path = SAMPLES_DIR / f"{config['name'].lower()}.json"
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False)
-            print(f"  Saved to {out_path}")
-        except Exception as e:
-            print(f"  ERROR fetching r/{config['name']}: {e}")
+    asyncio.run(fetch_all(configs))
 
     print(f"\nDone! Files in {SAMPLES_DIR}:")
     for p in sorted(SAMPLES_DIR.glob("*.json")):
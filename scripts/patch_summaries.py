@@ -11,7 +11,6 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -27,7 +26,7 @@ from backend.app.models import (
     PostWithSentiment,
     TribalTopic,
 )
-from backend.app.summarizer import generate_summary, generate_tribal_narrative
+from backend.app.summarizer import generate_summaries, generate_summary, run_with_gemini_client
 
 SAMPLES_DIR = PROJECT_ROOT / "backend" / "samples"
 
@@ -35,31 +34,31 @@ SAMPLES_DIR = PROJECT_ROOT / "backend" / "samples"
 def patch_file(path: Path, dry_run: bool) -> None:
     print(f"\n  {path.name}")
 
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-
-    result = AnalysisResponse(**data)
+    # pydantic-core parses and validates the bytes directly, no dict round-trip
+    result = AnalysisResponse.model_validate_json(path.read_bytes())
 
     old_summary = result.summary_text
     old_narrative = result.tribal_analysis.narrative if result.tribal_analysis else ""
 
     print(f"    summary_text before:   {len(old_summary):>4} chars  {old_summary[:80]!r}")
 
-    new_summary = generate_summary(
-        result.subreddit_summaries,
-        result.posts,
-        result.comments,
-        result.nlp_insights,
-        tribal_topics=result.tribal_analysis.topics if result.tribal_analysis else None,
-        ratioed_count=len(result.tribal_analysis.ratioed_posts) if result.tribal_analysis else 0,
-    )
-
     new_narrative = old_narrative
     if result.tribal_analysis and result.tribal_analysis.topics:
-        new_narrative = generate_tribal_narrative(
+        new_summary, new_narrative = run_with_gemini_client(generate_summaries(
+            result.subreddit_summaries,
+            result.posts,
+            result.comments,
+            result.nlp_insights,
             result.tribal_analysis.topics,
             result.tribal_analysis.ratioed_posts,
-        )
+        ))
+    else:
+        new_summary = run_with_gemini_client(generate_summary(
+            result.subreddit_summaries,
+            result.posts,
+            result.comments,
+            result.nlp_insights,
+        ))
 
     print(f"    summary_text after:    {len(new_summary):>4} chars  {new_summary[:80]!r}")
 
@@ -67,12 +66,12 @@ def patch_file(path: Path, dry_run: bool) -> None:
         print("    (dry run — not saved)")
         return
 
-    data["summary_text"] = new_summary
+    update: dict = {"summary_text": new_summary}
     if result.tribal_analysis:
-        data["tribal_analysis"]["narrative"] = new_narrative
-
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+        update["tribal_analysis"] = result.tribal_analysis.model_copy(
+            update={"narrative": new_narrative}
+        )
+    path.write_bytes(result.model_copy(update=update).model_dump_json().encode())
 
     print("    Saved.")
 
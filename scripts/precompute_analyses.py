@@ -8,18 +8,25 @@ serve results instantly without running the pipeline at request time.
 Usage:
     python scripts/precompute_analyses.py                        # all samples
     python scripts/precompute_analyses.py --subreddit askreddit  # one sample
+    python scripts/precompute_analyses.py --workers 4            # 4 samples at a time
+    python scripts/precompute_analyses.py --fresh                # don't reuse prior sentiments
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import multiprocessing
 import statistics
 import sys
-from collections import defaultdict
-from datetime import datetime, timezone
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
 from pathlib import Path
 
+import numpy as np
+import orjson
+
 # Add project root to sys.path so we can import backend modules
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -36,63 +43,126 @@ from backend.app.models import (
     RedditComment,
     RedditPost,
     SentimentLabel,
+    SentimentResult,
     SentimentStats,
     SubredditSentimentSummary,
     TimeSeriesPoint,
     TribalAnalysis,
 )
-from backend.app.nlp_analysis import run_full_nlp_analysis
-from backend.app.sentiment import analyze_batch, preload_model
-from backend.app.summarizer import generate_summary, generate_tribal_narrative
-from backend.app.tribal_logic import build_topic_groups, classify_tribalism, classify_ratioed_posts
+
+# Pipeline modules are imported where they're used, so a bad --subreddit fails
+# before any of them (or the model) load.
 
 SAMPLES_DIR = PROJECT_ROOT / "backend" / "samples"
 
 
-def _compute_sentiment_stats(scores: list[float], labels: list[SentimentLabel]) -> SentimentStats:
-    if not scores:
+def _scores_and_label_counts(
+    items: list[PostWithSentiment] | list[CommentWithSentiment],
+) -> tuple[np.ndarray, Counter[str]]:
+    """Compound scores of ``items`` as an array, and their label counts.
+
+    Scores go straight into the array and labels straight into the Counter,
+    with no intermediate lists.
+    """
+    scores = np.fromiter(
+        (item.sentiment.compound_score for item in items), dtype=np.float64, count=len(items)
+    )
+    return scores, Counter(item.sentiment.label for item in items)
+
+
+def _compute_sentiment_stats(scores: np.ndarray, label_counts: Counter[str]) -> SentimentStats:
+    if not len(scores):
         return SentimentStats(
             mean=0, median=0, std_dev=0,
             positive_pct=0, neutral_pct=0, negative_pct=0, total_count=0,
         )
-    total = len(labels)
+    total = len(scores)
     return SentimentStats(
-        mean=round(statistics.mean(scores), 4),
-        median=round(statistics.median(scores), 4),
-        std_dev=round(statistics.stdev(scores), 4) if len(scores) > 1 else 0,
-        positive_pct=round(labels.count(SentimentLabel.positive) / total * 100, 1),
-        neutral_pct=round(labels.count(SentimentLabel.neutral) / total * 100, 1),
-        negative_pct=round(labels.count(SentimentLabel.negative) / total * 100, 1),
+        mean=round(float(scores.mean()), 4),
+        median=round(float(np.median(scores)), 4),
+        std_dev=round(float(scores.std(ddof=1)), 4) if total > 1 else 0,
+        positive_pct=round(label_counts[SentimentLabel.positive] / total * 100, 1),
+        neutral_pct=round(label_counts[SentimentLabel.neutral] / total * 100, 1),
+        negative_pct=round(label_counts[SentimentLabel.negative] / total * 100, 1),
         total_count=total,
     )
 
 
+# Ordinal of 1970-01-01, for turning epoch-day numbers back into dates
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
 def _build_time_series(posts: list[PostWithSentiment]) -> list[TimeSeriesPoint]:
-    by_day_sub: dict[tuple[str, str], list[float]] = defaultdict(list)
-    for p in posts:
-        dt = datetime.fromtimestamp(p.post.created_utc, tz=timezone.utc)
-        day_str = dt.strftime("%Y-%m-%d")
-        by_day_sub[(day_str, p.post.subreddit)].append(p.sentiment.compound_score)
+    if not posts:
+        return []
+    # Key each post by (UTC day since the epoch, subreddit index), laid out so
+    # key order is (day, subreddit) order, and group with one stable argsort
+    # instead of a dict of lists. Each day is formatted once below. Means stay
+    # exact (statistics.mean): 4-decimal scores often average to a rounding tie.
+    n = len(posts)
+    days = np.fromiter((p.post.created_utc // 86400 for p in posts), dtype=np.int64, count=n)
+    scores = np.fromiter((p.sentiment.compound_score for p in posts), dtype=np.float64, count=n)
+    subs, sub_idx = np.unique([p.post.subreddit for p in posts], return_inverse=True)
+    first_day = int(days.min())
+    keys = (days - first_day) * len(subs) + sub_idx
+    counts = np.bincount(keys)
+    present = np.flatnonzero(counts)
+    groups = np.split(scores[np.argsort(keys, kind="stable")], np.cumsum(counts[present])[:-1])
 
     points = []
-    for (day, sub), scores in sorted(by_day_sub.items()):
+    for key, group in zip(present.tolist(), groups):
+        day, sub = divmod(key, len(subs))
         points.append(TimeSeriesPoint(
-            date=day,
-            avg_sentiment=round(statistics.mean(scores), 4),
-            count=len(scores),
-            subreddit=sub,
+            date=date.fromordinal(_EPOCH_ORDINAL + first_day + day).isoformat(),
+            avg_sentiment=round(statistics.mean(group.tolist()), 4),
+            count=len(group),
+            subreddit=str(subs[sub]),
         ))
     return points
 
 
-def process_sample(sample_path: Path) -> None:
-    """Run the full pipeline on one sample file and save the result."""
+def _load_prior_sentiments(analysis_path: Path) -> dict[str, SentimentResult]:
+    """Sentiments from an earlier run of this sample, keyed by analyzed text."""
+    if not analysis_path.exists():
+        return {}
+    try:
+        prior = AnalysisResponse.model_validate_json(analysis_path.read_bytes())
+    except (OSError, ValueError) as e:
+        print(f"  Ignoring unreadable {analysis_path.name}: {e}")
+        return {}
+    by_text = {f"{p.post.title} {p.post.selftext}": p.sentiment for p in prior.posts}
+    by_text.update((c.comment.body, c.sentiment) for c in prior.comments)
+    return by_text
+
+
+def _analyze_with_prior(
+    texts: list[str], prior: dict[str, SentimentResult],
+) -> list[SentimentResult | None]:
+    """analyze_batch, reusing ``prior`` results for texts scored before."""
+    from backend.app.sentiment import analyze_batch
+
+    todo = [t for t in texts if t not in prior]
+    print(f"  {len(texts) - len(todo)} texts reused from the previous run, {len(todo)} to analyze")
+    fresh = iter(analyze_batch(todo) if todo else ())
+    return [prior[t] if t in prior else next(fresh) for t in texts]
+
+
+def process_sample(sample_path: Path, fresh: bool = False) -> None:
+    """Run the full pipeline on one sample file and save the result.
+
+    Sentiments of texts unchanged since the last run are reused from the
+    existing analysis file unless ``fresh`` is set.
+    """
+    from backend.app.nlp_analysis import run_full_nlp_analysis
+    from backend.app.sentiment import analyze_batch
+    from backend.app.summarizer import generate_summaries, run_with_gemini_client
+    from backend.app.tribal_logic import build_topic_groups, classify_ratioed_posts, classify_tribalism
+
     print(f"\n{'='*60}")
     print(f"Processing {sample_path.name}")
     print(f"{'='*60}")
 
-    with open(sample_path, "r", encoding="utf-8") as f:
-        sample_data = json.load(f)
+    sample_data = orjson.loads(sample_path.read_bytes())
 
     subreddit = sample_data["subreddit"]
     analysis_id = f"sample_{subreddit.lower()}"
@@ -102,30 +172,36 @@ def process_sample(sample_path: Path) -> None:
 
     print(f"  Loaded {len(all_posts)} posts, {len(all_comments)} comments")
 
-    # Stage 1: Sentiment analysis on posts
-    print(f"  Analyzing sentiment for {len(all_posts)} posts...")
-    post_texts = [f"{p.title} {p.selftext}".strip() for p in all_posts]
-    post_sentiments = analyze_batch(post_texts)
+    out_path = sample_path.with_suffix(".analysis.json")
+    prior = {} if fresh else _load_prior_sentiments(out_path)
+
+    # Stages 1-2: Sentiment analysis on posts and comments in one batch, so
+    # the model sees a single length-bucketed queue; split back by position.
+    print(f"  Analyzing sentiment for {len(all_posts)} posts, {len(all_comments)} comments...")
+    # Built once for both sentiment and NLP; analyze_batch strips its input
+    post_texts = [f"{p.title} {p.selftext}" for p in all_posts]
+    comment_texts = [c.body for c in all_comments]
+    if prior:
+        sentiments = _analyze_with_prior(post_texts + comment_texts, prior)
+    else:
+        sentiments = analyze_batch(post_texts + comment_texts)
+    post_sentiments = sentiments[:len(post_texts)]
+    comment_sentiments = sentiments[len(post_texts):]
 
-    posts_with_sentiment = []
-    for post, sentiment in zip(all_posts, post_sentiments):
-        if sentiment is not None:
-            posts_with_sentiment.append(PostWithSentiment(post=post, sentiment=sentiment))
+    posts_with_sentiment = [
+        PostWithSentiment(post=p, sentiment=s)
+        for p, s in zip(all_posts, post_sentiments)
+        if s is not None
+    ]
 
     print(f"  Analyzed {len(posts_with_sentiment)} posts")
 
-    # Stage 2: Sentiment analysis on comments
-    comments_with_sentiment = []
+    comments_with_sentiment = [
+        CommentWithSentiment(comment=c, sentiment=s)
+        for c, s in zip(all_comments, comment_sentiments)
+        if s is not None
+    ]
     if all_comments:
-        print(f"  Analyzing sentiment for {len(all_comments)} comments...")
-        comment_texts = [c.body for c in all_comments]
-        comment_sentiments = analyze_batch(comment_texts)
-
-        for comment, sentiment in zip(all_comments, comment_sentiments):
-            if sentiment is not None:
-                comments_with_sentiment.append(
-                    CommentWithSentiment(comment=comment, sentiment=sentiment)
-                )
         print(f"  Analyzed {len(comments_with_sentiment)} comments")
 
     # Stage 3: Aggregate stats
@@ -133,15 +209,13 @@ def process_sample(sample_path: Path) -> None:
     sub_posts = posts_with_sentiment
     sub_comments = comments_with_sentiment
 
-    post_scores = [p.sentiment.compound_score for p in sub_posts]
-    post_labels = [p.sentiment.label for p in sub_posts]
-    post_stats = _compute_sentiment_stats(post_scores, post_labels)
+    post_scores, post_label_counts = _scores_and_label_counts(sub_posts)
+    post_stats = _compute_sentiment_stats(post_scores, post_label_counts)
 
+    comment_scores, comment_label_counts = _scores_and_label_counts(sub_comments)
     comment_stats = None
     if sub_comments:
-        comment_scores = [c.sentiment.compound_score for c in sub_comments]
-        comment_labels = [c.sentiment.label for c in sub_comments]
-        comment_stats = _compute_sentiment_stats(comment_scores, comment_labels)
+        comment_stats = _compute_sentiment_stats(comment_scores, comment_label_counts)
 
     subreddit_summaries = [SubredditSentimentSummary(
         subreddit=subreddit,
@@ -155,8 +229,8 @@ def process_sample(sample_path: Path) -> None:
 
     # Stage 4: NLP analysis
     print("  Running NLP analysis (entities, n-grams, statistics)...")
-    nlp_post_texts = [f"{p.post.title} {p.post.selftext}" for p in posts_with_sentiment]
-    nlp_comment_texts = [c.comment.body for c in comments_with_sentiment] if comments_with_sentiment else None
+    nlp_post_texts = [t for t, s in zip(post_texts, post_sentiments) if s is not None]
+    nlp_comment_texts = [t for t, s in zip(comment_texts, comment_sentiments) if s is not None] or None
     nlp_insights = run_full_nlp_analysis(nlp_post_texts, nlp_comment_texts)
 
     # Stage 4.5: Tribal analysis
@@ -169,26 +243,23 @@ def process_sample(sample_path: Path) -> None:
     )
     tribal_topics = classify_tribalism(topic_groups)
     ratioed_posts = classify_ratioed_posts(posts_with_sentiment, comments_with_sentiment)
-    tribal_narrative = generate_tribal_narrative(tribal_topics, ratioed_posts)
+    print(f"  Found {len(tribal_topics)} tribal topics")
+
+    # Stage 5: Generate summary and tribal narrative
+    print("  Generating summary...")
+    summary_text, tribal_narrative = run_with_gemini_client(generate_summaries(
+        subreddit_summaries, posts_with_sentiment, comments_with_sentiment, nlp_insights,
+        tribal_topics, ratioed_posts,
+    ))
 
     tribal_analysis = TribalAnalysis(
         topics=tribal_topics,
         ratioed_posts=ratioed_posts,
         narrative=tribal_narrative,
     )
-    print(f"  Found {len(tribal_topics)} tribal topics")
-
-    # Stage 5: Generate summary
-    print("  Generating summary...")
-    summary_text = generate_summary(
-        subreddit_summaries, posts_with_sentiment, comments_with_sentiment, nlp_insights,
-        tribal_topics=tribal_topics, ratioed_count=len(ratioed_posts),
-    )
 
     # Build final response
-    sentiment_distribution = [p.sentiment.compound_score for p in posts_with_sentiment]
-    if comments_with_sentiment:
-        sentiment_distribution.extend(c.sentiment.compound_score for c in comments_with_sentiment)
+    sentiment_distribution = np.concatenate([post_scores, comment_scores])
 
     result = AnalysisResponse(
         analysis_id=analysis_id,
@@ -203,24 +274,34 @@ def process_sample(sample_path: Path) -> None:
     )
 
     # Save
-    out_path = sample_path.with_suffix(".analysis.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(result.model_dump(), f, ensure_ascii=False)
+    out_path.write_bytes(result.model_dump_json().encode())
 
     size_mb = out_path.stat().st_size / (1024 * 1024)
     print(f"  Saved to {out_path.name} ({size_mb:.1f} MB)")
 
 
+def _process_sample_safe(sample_path: Path, fresh: bool = False) -> None:
+    """process_sample that reports errors instead of raising, so one bad
+    sample doesn't stop the rest of a batch."""
+    try:
+        process_sample(sample_path, fresh)
+    except Exception as e:
+        print(f"  ERROR processing {sample_path.name}: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pre-compute analysis for sample datasets")
     parser.add_argument("--subreddit", type=str, help="Process a single subreddit")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Process samples in this many worker processes (each loads its own model copy)",
+    )
+    parser.add_argument(
+        "--fresh", action="store_true",
+        help="Re-run sentiment on every text (e.g. after a model change) instead of reusing prior results",
+    )
     args = parser.parse_args()
 
-    # Preload the sentiment model once
-    print("Preloading sentiment model...")
-    preload_model()
-    print("Model ready.\n")
-
     if args.subreddit:
         path = SAMPLES_DIR / f"{args.subreddit.lower()}.json"
         if not path.exists():
@@ -228,18 +309,36 @@ def main():
             available = [p.stem for p in SAMPLES_DIR.glob("*.json") if not p.name.endswith(".analysis.json")]
             print(f"Available: {', '.join(available)}")
             raise SystemExit(1)
-        process_sample(path)
+        paths = [path]
     else:
         paths = sorted(
             p for p in SAMPLES_DIR.glob("*.json")
             if not p.name.endswith(".analysis.json")
         )
+
+    from backend.app.sentiment import preload_model
+
+    if args.subreddit or args.workers <= 1:
+        # Preload the sentiment model once
+        print("Preloading sentiment model...")
+        preload_model()
+        print("Model ready.\n")
+
+    if args.subreddit:
+        process_sample(path, args.fresh)
+    else:
         print(f"Processing {len(paths)} samples...")
-        for path in paths:
-            try:
-                process_sample(path)
-            except Exception as e:
-                print(f"  ERROR processing {path.name}: {e}")
+        if args.workers > 1:
+            # Spawned workers each preload the model once; torch isn't fork-safe
+            with ProcessPoolExecutor(
+                max_workers=min(args.workers, len(paths)) or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload_model,
+            ) as pool:
+                list(pool.map(partial(_process_sample_safe, fresh=args.fresh), paths))
+        else:
+            for path in paths:
+                _process_sample_safe(path, args.fresh)
 
     print("\nDone!")
     for p in sorted(SAMPLES_DIR.glob("*.analysis.json")):
@@ -13,7 +13,6 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -27,7 +26,7 @@ from backend.app.models import (
     TribalAnalysis,
 )
 from backend.app.nlp_analysis import run_full_nlp_analysis
-from backend.app.summarizer import generate_summary, generate_tribal_narrative
+from backend.app.summarizer import generate_summaries, run_with_gemini_client
 from backend.app.tribal_logic import build_topic_groups, classify_tribalism, classify_ratioed_posts
 
 SAMPLES_DIR = PROJECT_ROOT / "backend" / "samples"
@@ -38,10 +37,9 @@ def reprocess(analysis_path: Path) -> None:
     print(f"Reprocessing {analysis_path.name}")
     print(f"{'='*60}")
 
-    with open(analysis_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    result = AnalysisResponse(**data)
+    # One pass from bytes to models; the posts and comments are needed as
+    # models below, so validation can't be skipped, only the dict tree.
+    result = AnalysisResponse.model_validate_json(analysis_path.read_bytes())
 
     posts = result.posts
     comments = result.comments or []
@@ -65,25 +63,23 @@ def reprocess(analysis_path: Path) -> None:
     )
     tribal_topics = classify_tribalism(topic_groups)
     ratioed_posts = classify_ratioed_posts(posts, comments)
-    tribal_narrative = generate_tribal_narrative(tribal_topics, ratioed_posts)
+    print(f"  Found {len(tribal_topics)} tribal topics")
+
+    # Re-generate summary and narrative (uses bigrams, entities, tribal data)
+    print("  Regenerating summary...")
+    result.summary_text, tribal_narrative = run_with_gemini_client(generate_summaries(
+        result.subreddit_summaries, posts, comments, nlp_insights,
+        tribal_topics, ratioed_posts,
+    ))
 
     result.tribal_analysis = TribalAnalysis(
         topics=tribal_topics,
         ratioed_posts=ratioed_posts,
         narrative=tribal_narrative,
     )
-    print(f"  Found {len(tribal_topics)} tribal topics")
-
-    # Re-generate summary (uses bigrams, entities, tribal data)
-    print("  Regenerating summary...")
-    result.summary_text = generate_summary(
-        result.subreddit_summaries, posts, comments, nlp_insights,
-        tribal_topics=tribal_topics, ratioed_count=len(ratioed_posts),
-    )
 
     # Save
-    with open(analysis_path, "w", encoding="utf-8") as f:
-        json.dump(result.model_dump(), f, ensure_ascii=False)
+    analysis_path.write_bytes(result.model_dump_json().encode())
 
     size_mb = analysis_path.stat().st_size / (1024 * 1024)
     print(f"  Saved {analysis_path.name} ({size_mb:.1f} MB)")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Weekly scraper — fetches top/week data for all configured subreddits and
-saves raw data + full AnalysisResponse + metadata to
+saves raw data (gzipped) + full AnalysisResponse + metadata to
 ``backend/data/snapshots/{YYYY-MM-DD}/{subreddit}/``.
 
 Usage:
@@ -14,13 +14,18 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import gzip
 import json
 import statistics
 import sys
 import time
-from collections import defaultdict
+from collections import Counter
 from datetime import date, datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+import orjson
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -40,93 +45,150 @@ from backend.app.models import (
     TimeSeriesPoint,
     TribalAnalysis,
 )
-from backend.app.nlp_analysis import run_full_nlp_analysis
-from backend.app.reddit_client import RedditClient
-from backend.app.sentiment import analyze_batch, preload_model
-from backend.app.summarizer import generate_summary, generate_tribal_narrative
-from backend.app.tribal_logic import build_topic_groups, classify_tribalism, classify_ratioed_posts
 from backend.app.models import SortMethod, TimeFilter
 
+# Pipeline modules are imported where they're used, so --dry-run and argument
+# errors don't pay for them (or for the client's missing-credentials warning).
+if TYPE_CHECKING:
+    from backend.app.reddit_client import RedditClient
+
 SUBREDDITS_JSON = PROJECT_ROOT / "scripts" / "subreddits.json"
 SNAPSHOTS_DIR = PROJECT_ROOT / "backend" / "data" / "snapshots"
 
-INTER_SUBREDDIT_DELAY = 2  # seconds between subreddits
+INTER_SUBREDDIT_DELAY = 2  # seconds between subreddit fetches
+# raw_data is write-once and compresses ~3x; level 3 is ~10% larger than
+# level 9 at half the CPU time.
+RAW_DATA_GZIP_LEVEL = 3
 
 
 # ── Pipeline helpers (mirrors precompute_analyses.py) ─────────────────────
 
-def _compute_sentiment_stats(scores: list[float], labels: list[SentimentLabel]) -> SentimentStats:
-    if not scores:
+def _scores_and_label_counts(
+    items: list[PostWithSentiment] | list[CommentWithSentiment],
+) -> tuple[np.ndarray, Counter[str]]:
+    """Compound scores of ``items`` as an array, and their label counts.
+
+    Scores go straight into the array and labels straight into the Counter,
+    with no intermediate lists.
+    """
+    scores = np.fromiter(
+        (item.sentiment.compound_score for item in items), dtype=np.float64, count=len(items)
+    )
+    return scores, Counter(item.sentiment.label for item in items)
+
+
+def _compute_sentiment_stats(scores: np.ndarray, label_counts: Counter[str]) -> SentimentStats:
+    if not len(scores):
         return SentimentStats(
             mean=0, median=0, std_dev=0,
             positive_pct=0, neutral_pct=0, negative_pct=0, total_count=0,
         )
-    total = len(labels)
+    total = len(scores)
     return SentimentStats(
-        mean=round(statistics.mean(scores), 4),
-        median=round(statistics.median(scores), 4),
-        std_dev=round(statistics.stdev(scores), 4) if len(scores) > 1 else 0,
-        positive_pct=round(labels.count(SentimentLabel.positive) / total * 100, 1),
-        neutral_pct=round(labels.count(SentimentLabel.neutral) / total * 100, 1),
-        negative_pct=round(labels.count(SentimentLabel.negative) / total * 100, 1),
+        mean=round(float(scores.mean()), 4),
+        median=round(float(np.median(scores)), 4),
+        std_dev=round(float(scores.std(ddof=1)), 4) if total > 1 else 0,
+        positive_pct=round(label_counts[SentimentLabel.positive] / total * 100, 1),
+        neutral_pct=round(label_counts[SentimentLabel.neutral] / total * 100, 1),
+        negative_pct=round(label_counts[SentimentLabel.negative] / total * 100, 1),
         total_count=total,
     )
 
 
+# Ordinal of 1970-01-01, for turning epoch-day numbers back into dates
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
 def _build_time_series(posts: list[PostWithSentiment]) -> list[TimeSeriesPoint]:
-    by_day_sub: dict[tuple[str, str], list[float]] = defaultdict(list)
-    for p in posts:
-        dt = datetime.fromtimestamp(p.post.created_utc, tz=timezone.utc)
-        day_str = dt.strftime("%Y-%m-%d")
-        by_day_sub[(day_str, p.post.subreddit)].append(p.sentiment.compound_score)
+    if not posts:
+        return []
+    # Key each post by (UTC day since the epoch, subreddit index), laid out so
+    # key order is (day, subreddit) order, and group with one stable argsort
+    # instead of a dict of lists. Each day is formatted once below. Means stay
+    # exact (statistics.mean): 4-decimal scores often average to a rounding tie.
+    n = len(posts)
+    days = np.fromiter((p.post.created_utc // 86400 for p in posts), dtype=np.int64, count=n)
+    scores = np.fromiter((p.sentiment.compound_score for p in posts), dtype=np.float64, count=n)
+    subs, sub_idx = np.unique([p.post.subreddit for p in posts], return_inverse=True)
+    first_day = int(days.min())
+    keys = (days - first_day) * len(subs) + sub_idx
+    counts = np.bincount(keys)
+    present = np.flatnonzero(counts)
+    groups = np.split(scores[np.argsort(keys, kind="stable")], np.cumsum(counts[present])[:-1])
+
     points = []
-    for (day, sub), scores in sorted(by_day_sub.items()):
+    for key, group in zip(present.tolist(), groups):
+        day, sub = divmod(key, len(subs))
         points.append(TimeSeriesPoint(
-            date=day,
-            avg_sentiment=round(statistics.mean(scores), 4),
-            count=len(scores),
-            subreddit=sub,
+            date=date.fromordinal(_EPOCH_ORDINAL + first_day + day).isoformat(),
+            avg_sentiment=round(statistics.mean(group.tolist()), 4),
+            count=len(group),
+            subreddit=str(subs[sub]),
         ))
     return points
 
 
-def run_pipeline(
+def _write_raw_data(
+    f: BinaryIO,
+    subreddit: str,
+    posts: list[RedditPost],
+    comments: list[RedditComment],
+) -> None:
+    """Write {"subreddit", "posts", "comments"} one item at a time, so the
+    dumped lists are never held in memory alongside the models."""
+    f.write(b'{"subreddit":' + json.dumps(subreddit, ensure_ascii=False).encode())
+    for key, items in ((b"posts", posts), (b"comments", comments)):
+        f.write(b',"' + key + b'":[')
+        for i, item in enumerate(items):
+            if i:
+                f.write(b",")
+            f.write(item.model_dump_json().encode())
+        f.write(b"]")
+    f.write(b"}")
+
+
+async def run_pipeline(
     subreddit: str,
     posts: list[RedditPost],
     comments: list[RedditComment],
     analysis_id: str,
 ) -> AnalysisResponse:
     """Run the full sentiment + NLP + tribal + summary pipeline on fetched data."""
-    print(f"    Sentiment analysis ({len(posts)} posts)...")
-    post_texts = [f"{p.title} {p.selftext}".strip() for p in posts]
-    post_sentiments = analyze_batch(post_texts)
+    from backend.app.nlp_analysis import run_full_nlp_analysis
+    from backend.app.sentiment import analyze_batch
+    from backend.app.summarizer import generate_summaries
+    from backend.app.tribal_logic import build_topic_groups, classify_ratioed_posts, classify_tribalism
+
+    # Texts are built once for both sentiment and NLP (analyze_batch strips
+    # them). Posts and comments go to the model as one length-bucketed batch
+    # and are split back by position. Model and NLP stages run in a thread
+    # so the next subreddit's fetch (started by scrape_all) keeps going.
+    print(f"    Sentiment analysis ({len(posts)} posts, {len(comments)} comments)...")
+    post_texts = [f"{p.title} {p.selftext}" for p in posts]
+    comment_texts = [c.body for c in comments]
+    loop = asyncio.get_event_loop()
+    sentiments = await loop.run_in_executor(None, analyze_batch, post_texts + comment_texts)
+    post_sentiments = sentiments[:len(posts)]
+    comment_sentiments = sentiments[len(posts):]
     posts_with_sentiment = [
         PostWithSentiment(post=p, sentiment=s)
         for p, s in zip(posts, post_sentiments)
         if s is not None
     ]
-
-    comments_with_sentiment: list[CommentWithSentiment] = []
-    if comments:
-        print(f"    Sentiment analysis ({len(comments)} comments)...")
-        comment_texts = [c.body for c in comments]
-        comment_sentiments = analyze_batch(comment_texts)
-        comments_with_sentiment = [
-            CommentWithSentiment(comment=c, sentiment=s)
-            for c, s in zip(comments, comment_sentiments)
-            if s is not None
-        ]
+    comments_with_sentiment = [
+        CommentWithSentiment(comment=c, sentiment=s)
+        for c, s in zip(comments, comment_sentiments)
+        if s is not None
+    ]
 
     # Aggregate stats
-    post_scores = [p.sentiment.compound_score for p in posts_with_sentiment]
-    post_labels = [p.sentiment.label for p in posts_with_sentiment]
-    post_stats = _compute_sentiment_stats(post_scores, post_labels)
+    post_scores, post_label_counts = _scores_and_label_counts(posts_with_sentiment)
+    post_stats = _compute_sentiment_stats(post_scores, post_label_counts)
 
+    c_scores, c_label_counts = _scores_and_label_counts(comments_with_sentiment)
     comment_stats = None
     if comments_with_sentiment:
-        c_scores = [c.sentiment.compound_score for c in comments_with_sentiment]
-        c_labels = [c.sentiment.label for c in comments_with_sentiment]
-        comment_stats = _compute_sentiment_stats(c_scores, c_labels)
+        comment_stats = _compute_sentiment_stats(c_scores, c_label_counts)
 
     subreddit_summaries = [SubredditSentimentSummary(
         subreddit=subreddit,
@@ -139,9 +201,9 @@ def run_pipeline(
 
     # NLP
     print("    NLP analysis (entities, n-grams, statistics)...")
-    nlp_post_texts = [f"{p.post.title} {p.post.selftext}" for p in posts_with_sentiment]
-    nlp_comment_texts = [c.comment.body for c in comments_with_sentiment] if comments_with_sentiment else None
-    nlp_insights = run_full_nlp_analysis(nlp_post_texts, nlp_comment_texts)
+    nlp_post_texts = [t for t, s in zip(post_texts, post_sentiments) if s is not None]
+    nlp_comment_texts = [t for t, s in zip(comment_texts, comment_sentiments) if s is not None] or None
+    nlp_insights = await loop.run_in_executor(None, run_full_nlp_analysis, nlp_post_texts, nlp_comment_texts)
 
     # Tribal
     print("    Tribal classification...")
@@ -151,21 +213,18 @@ def run_pipeline(
     )
     tribal_topics = classify_tribalism(topic_groups)
     ratioed_posts = classify_ratioed_posts(posts_with_sentiment, comments_with_sentiment)
-    tribal_narrative = generate_tribal_narrative(tribal_topics, ratioed_posts)
-    tribal_analysis = TribalAnalysis(
-        topics=tribal_topics, ratioed_posts=ratioed_posts, narrative=tribal_narrative,
-    )
 
-    # Summary
+    # Summary and tribal narrative
     print("    Generating summary...")
-    summary_text = generate_summary(
+    summary_text, tribal_narrative = await generate_summaries(
         subreddit_summaries, posts_with_sentiment, comments_with_sentiment, nlp_insights,
-        tribal_topics=tribal_topics, ratioed_count=len(ratioed_posts),
+        tribal_topics, ratioed_posts,
+    )
+    tribal_analysis = TribalAnalysis(
+        topics=tribal_topics, ratioed_posts=ratioed_posts, narrative=tribal_narrative,
     )
 
-    sentiment_distribution = [p.sentiment.compound_score for p in posts_with_sentiment]
-    if comments_with_sentiment:
-        sentiment_distribution.extend(c.sentiment.compound_score for c in comments_with_sentiment)
+    sentiment_distribution = np.concatenate([post_scores, c_scores])
 
     return AnalysisResponse(
         analysis_id=analysis_id,
@@ -189,20 +248,28 @@ async def fetch_subreddit(
     depth: int,
 ) -> tuple[list[RedditPost], list[RedditComment]]:
     """Fetch top/week posts and comments for top-50 posts."""
-    print(f"    Fetching {limit} posts (top/week)...")
+    from backend.app.reddit_client import COMMENT_FETCH_CONCURRENCY
+
+    print(f"    r/{name}: fetching {limit} posts (top/week)...")
     posts = await client.fetch_posts(
         subreddit=name,
         sort=SortMethod.top,
         time_filter=TimeFilter.week,
         limit=limit,
     )
-    print(f"    Fetched {len(posts)} posts. Fetching comments for top 50...")
-    comments: list[RedditComment] = []
-    for post in posts[:50]:
-        post_comments = await client.fetch_comments(name, post.id, depth=depth)
-        comments.extend(post_comments)
-        await asyncio.sleep(0.7)  # rate limit
-    print(f"    Fetched {len(comments)} comments total.")
+    print(f"    r/{name}: fetched {len(posts)} posts. Fetching comments for top 50...")
+    semaphore = asyncio.Semaphore(COMMENT_FETCH_CONCURRENCY)
+
+    async def fetch_one(post: RedditPost) -> list[RedditComment]:
+        async with semaphore:
+            return await client.fetch_comments(name, post.id, depth=depth)
+
+    # Requests overlap up to the semaphore size; the client's rate limiter
+    # keeps the overall request rate within Reddit's limit. gather keeps
+    # results in post order.
+    results = await asyncio.gather(*(fetch_one(p) for p in posts[:50]))
+    comments = [c for post_comments in results for c in post_comments]
+    print(f"    r/{name}: fetched {len(comments)} comments total.")
     return posts, comments
 
 
@@ -219,69 +286,85 @@ async def scrape_all(
             print(f"  r/{cfg['name']:20}  limit={cfg['limit']}  depth={cfg['depth']}")
         return
 
+    from backend.app.reddit_client import RedditClient
+    from backend.app.sentiment import preload_model
+    from backend.app.summarizer import close_gemini_client
+
     preload_model()
     client = RedditClient()
 
     results: list[dict] = []
 
-    for i, cfg in enumerate(subreddit_configs):
-        name = cfg["name"]
-        description = cfg.get("description", "")
-        limit = cfg.get("limit", 200)
-        depth = cfg.get("depth", 2)
-
-        print(f"\n[{i+1}/{len(subreddit_configs)}] r/{name}")
-        t0 = time.monotonic()
-
-        try:
-            posts, comments = await fetch_subreddit(client, name, limit, depth)
-
-            snap_dir = SNAPSHOTS_DIR / snap_date / name.lower()
-            snap_dir.mkdir(parents=True, exist_ok=True)
-
-            # raw_data.json
-            raw = {
-                "subreddit": name,
-                "posts": [p.model_dump() for p in posts],
-                "comments": [c.model_dump() for c in comments],
-            }
-            with open(snap_dir / "raw_data.json", "w", encoding="utf-8") as f:
-                json.dump(raw, f, ensure_ascii=False)
-
-            # Run pipeline
-            analysis_id = f"snapshot_{name.lower()}_{snap_date}"
-            result = run_pipeline(name, posts, comments, analysis_id)
-
-            # analysis.json
-            with open(snap_dir / "analysis.json", "w", encoding="utf-8") as f:
-                json.dump(result.model_dump(), f, ensure_ascii=False)
-
-            duration = round(time.monotonic() - t0, 1)
-
-            # metadata.json
-            meta = {
-                "date": snap_date,
-                "subreddit": name,
-                "description": description,
-                "post_count": len(posts),
-                "comment_count": len(comments),
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "scrape_duration_seconds": duration,
-            }
-            with open(snap_dir / "metadata.json", "w", encoding="utf-8") as f:
-                json.dump(meta, f, ensure_ascii=False, indent=2)
-
-            print(f"    Saved to {snap_dir}  ({duration}s)")
-            results.append({"subreddit": name, "status": "ok", "posts": len(posts), "comments": len(comments), "duration": duration})
-
-        except Exception as e:
-            duration = round(time.monotonic() - t0, 1)
-            print(f"    ERROR: {e}")
-            results.append({"subreddit": name, "status": "error", "error": str(e), "duration": duration})
-
-        if i < len(subreddit_configs) - 1:
-            print(f"    Waiting {INTER_SUBREDDIT_DELAY}s before next subreddit...")
-            await asyncio.sleep(INTER_SUBREDDIT_DELAY)
+    async def fetch(cfg: dict, delay: float = 0) -> tuple[list[RedditPost], list[RedditComment]]:
+        if delay:
+            await asyncio.sleep(delay)
+        return await fetch_subreddit(client, cfg["name"], cfg.get("limit", 200), cfg.get("depth", 2))
+
+    # Each subreddit's fetch is started while the previous one's pipeline
+    # runs, so network and model time overlap instead of adding up.
+    next_fetch = asyncio.create_task(fetch(subreddit_configs[0])) if subreddit_configs else None
+
+    try:
+        for i, cfg in enumerate(subreddit_configs):
+            name = cfg["name"]
+            description = cfg.get("description", "")
+
+            print(f"\n[{i+1}/{len(subreddit_configs)}] r/{name}")
+            t0 = time.monotonic()
+
+            # Wait for this fetch (without raising), then start the next one
+            fetch_task = next_fetch
+            await asyncio.wait([fetch_task])
+            if i < len(subreddit_configs) - 1:
+                next_fetch = asyncio.create_task(fetch(subreddit_configs[i + 1], INTER_SUBREDDIT_DELAY))
+
+            try:
+                posts, comments = fetch_task.result()
+
+                snap_dir = SNAPSHOTS_DIR / snap_date / name.lower()
+                snap_dir.mkdir(parents=True, exist_ok=True)
+
+                # raw_data.json.gz (only kept for reprocessing, so compress it)
+                with gzip.open(snap_dir / "raw_data.json.gz", "wb", compresslevel=RAW_DATA_GZIP_LEVEL) as f:
+                    _write_raw_data(f, name, posts, comments)
+
+                # Run pipeline
+                analysis_id = f"snapshot_{name.lower()}_{snap_date}"
+                result = await run_pipeline(name, posts, comments, analysis_id)
+
+                # analysis.json
+                (snap_dir / "analysis.json").write_bytes(result.model_dump_json().encode())
+
+                duration = round(time.monotonic() - t0, 1)
+
+                # metadata.json
+                meta = {
+                    "date": snap_date,
+                    "subreddit": name,
+                    "description": description,
+                    "post_count": len(posts),
+                    "comment_count": len(comments),
+                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                    "scrape_duration_seconds": duration,
+                }
+                with open(snap_dir / "metadata.json", "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False, indent=2)
+
+                print(f"    Saved to {snap_dir}  ({duration}s)")
+                results.append({"subreddit": name, "status": "ok", "posts": len(posts), "comments": len(comments), "duration": duration})
+
+            except Exception as e:
+                duration = round(time.monotonic() - t0, 1)
+                print(f"    ERROR: {e}")
+                results.append({"subreddit": name, "status": "error", "error": str(e), "duration": duration})
+    finally:
+        # Stop a prefetch still in flight (e.g. after Ctrl-C) before the
+        # client it uses is closed
+        if next_fetch is not None and not next_fetch.done():
+            next_fetch.cancel()
+            await asyncio.wait([next_fetch])
+        await client.aclose()
+        await close_gemini_client()
 
     # Summary table
     print(f"\n{'─'*60}")
@@ -304,8 +387,7 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="Print plan without fetching")
     args = parser.parse_args()
 
-    with open(SUBREDDITS_JSON, encoding="utf-8") as f:
-        all_configs: list[dict] = json.load(f)
+    all_configs: list[dict] = orjson.loads(SUBREDDITS_JSON.read_bytes())
 
     if args.subreddit:
         target = args.subreddit.lower()